@@ -1,16 +1,141 @@
 import os
 import json
+import time
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict
-from crewai import Agent, Task, Crew, Process
+import numpy as np
+from crewai import Agent, Task, Crew, Process, LLM
 from tavily import TavilyClient
 from dotenv import load_dotenv
+from resource_enricher import ResourceEnricher
+from async_clients import AsyncTavilyClient, AsyncLLMClient
+from model_router import ModelRouter
+from package_cache import PackageCache
+from load_shedding import FULL, REDUCED, MINIMAL, CACHE_ONLY, ERROR, OverloadedError
+from ranking import CandidateIndex, InterestRanker, MATCH_THRESHOLD, top_k
 
 # Load environment variables
 load_dotenv()
 
+# Fallback course catalog used when course search or parsing fails
+FALLBACK_COURSES = [
+    {
+        "id": "1",
+        "title": "Complete Machine Learning & Data Science Bootcamp",
+        "platform": "YouTube",
+        "instructor": "freeCodeCamp.org",
+        "duration": "11 hours",
+        "rating": 4.8,
+        "thumbnail": "https://i.ytimg.com/vi/cBBTWcHkVVY/hqdefault.jpg",
+        "url": "https://www.youtube.com/watch?v=cBBTWcHkVVY",
+        "tags": ["Machine Learning", "Data Science", "Python"]
+    },
+    {
+        "id": "2",
+        "title": "JavaScript Crash Course for Beginners",
+        "platform": "YouTube",
+        "instructor": "Traversy Media",
+        "duration": "1.5 hours",
+        "rating": 4.9,
+        "thumbnail": "https://i.ytimg.com/vi/hdI2bqOjy3c/hqdefault.jpg",
+        "url": "https://www.youtube.com/watch?v=hdI2bqOjy3c",
+        "tags": ["JavaScript", "Web Development", "Programming"]
+    },
+    {
+        "id": "3",
+        "title": "Modern React with Redux",
+        "platform": "Udemy",
+        "instructor": "Stephen Grider",
+        "duration": "52 hours",
+        "rating": 4.7,
+        "thumbnail": "/api/placeholder/400/220",
+        "url": "https://www.udemy.com/course/react-redux/",
+        "tags": ["React", "Redux", "Web Development"]
+    },
+    {
+        "id": "4",
+        "title": "Python for Everybody",
+        "platform": "Coursera",
+        "instructor": "University of Michigan",
+        "duration": "8 weeks",
+        "rating": 4.8,
+        "thumbnail": "/api/placeholder/400/220",
+        "url": "https://www.coursera.org/specializations/python",
+        "tags": ["Python", "Programming", "Computer Science"]
+    },
+    {
+        "id": "5",
+        "title": "The Web Developer Bootcamp",
+        "platform": "Udemy",
+        "instructor": "Colt Steele",
+        "duration": "63 hours",
+        "rating": 4.7,
+        "thumbnail": "/api/placeholder/400/220",
+        "url": "https://www.udemy.com/course/the-web-developer-bootcamp/",
+        "tags": ["Web Development", "HTML", "CSS", "JavaScript"]
+    },
+    {
+        "id": "6",
+        "title": "Introduction to Quantum Computing",
+        "platform": "edX",
+        "instructor": "MIT",
+        "duration": "6 weeks",
+        "rating": 4.6,
+        "thumbnail": "/api/placeholder/400/220",
+        "url": "https://www.edx.org/course/quantum-computing",
+        "tags": ["Quantum Computing", "Physics", "Computer Science"]
+    },
+    {
+        "id": "7",
+        "title": "Complete Digital Marketing Course",
+        "platform": "YouTube",
+        "instructor": "SimpliLearn",
+        "duration": "8 hours",
+        "rating": 4.5,
+        "thumbnail": "/api/placeholder/400/220",
+        "url": "https://www.youtube.com/watch?v=hD-SXLYgRZ0",
+        "tags": ["Digital Marketing", "SEO", "Social Media"]
+    },
+    {
+        "id": "8",
+        "title": "Introduction to Artificial Intelligence",
+        "platform": "Coursera",
+        "instructor": "Stanford University",
+        "duration": "11 weeks",
+        "rating": 4.8,
+        "thumbnail": "/api/placeholder/400/220",
+        "url": "https://www.coursera.org/learn/introduction-to-ai",
+        "tags": ["AI", "Machine Learning", "Computer Science"]
+    }
+]
+
+# Basic trending topics used when the trending lookup fails outright
+BASIC_TRENDING_TOPICS = [
+    "Latest developments in technology",
+    "Scientific discoveries of the year",
+    "Historical events that shaped today",
+    "Mathematical concepts explained simply",
+    "Understanding world economics"
+]
+
+# Course platforms searched for recommendations, and the thumbnail shown when a course has none
+COURSE_DOMAINS = ["youtube.com", "udemy.com", "coursera.org", "edx.org", "skillshare.com"]
+THUMBNAIL_PLACEHOLDER = '/api/placeholder/400/225'
+
 class LeemboAI:
-    def __init__(self):
+    def __init__(self, cache_dir: str = None):
         self.tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+        self.package_cache = PackageCache(cache_dir)
+        # Pooled async clients used by the a*-prefixed methods
+        self.async_tavily_client = AsyncTavilyClient()
+        self.llm_client = AsyncLLMClient()
+        self.resource_enricher = ResourceEnricher()
+        self.model_router = ModelRouter()
+        self.ranker = InterestRanker()
+        self.fallback_course_index = CandidateIndex.from_courses(FALLBACK_COURSES)
+        self._llms = {}
         self.setup_agents()
         self.current_session = {}
         self.pending_assessment = None
@@ -24,7 +149,8 @@ class LeemboAI:
             Your job is to quickly gauge a learner's current knowledge level and preferred learning method.
             Always return your assessment as a JSON string in the format: 
             {"level": "Beginner/Intermediate/Advanced", "style": "Visual/Auditory/Reading/Kinesthetic"}""",
-            allow_delegation=False
+            allow_delegation=False,
+            llm=self._build_llm(self.model_router.route("level_assessor").primary)
         )
 
         # Tavily Curator Agent
@@ -35,7 +161,8 @@ class LeemboAI:
             you find the most relevant and high-quality learning materials tailored to the user's level.
             Always return your curated resources as a JSON string containing an array of resources in the format:
             [{"title": "Resource Title", "url": "Resource URL", "summary": "Brief summary"}]""",
-            allow_delegation=False
+            allow_delegation=False,
+            llm=self._build_llm(self.model_router.route("curator").primary)
         )
 
         # Trend Analyzer Agent (New)
@@ -48,7 +175,8 @@ class LeemboAI:
             unless they have significant learning potential.
             Always return your analysis as a JSON string containing an array of trending topics in the format:
             [{"topic": "Topic Title", "category": "Technology/Science/Humanities/etc", "relevance_score": 0-10}]""",
-            allow_delegation=False
+            allow_delegation=False,
+            llm=self._build_llm(self.model_router.route("trend_analyzer").primary)
         )
 
         # Explainer Agent
@@ -58,7 +186,8 @@ class LeemboAI:
             backstory="""You are an expert teacher who can explain any concept clearly and effectively.
             You adapt your explanations based on the learner's level and preferred learning style.
             Return your explanation as a clear, markdown-formatted text.""",
-            allow_delegation=False
+            allow_delegation=False,
+            llm=self._build_llm(self.model_router.route("explainer").primary)
         )
 
         # Quiz Generator Agent
@@ -69,9 +198,97 @@ class LeemboAI:
             while maintaining engagement. Your questions adapt to the user's knowledge level.
             Always return your quiz as a JSON string containing an array of questions in the format:
             [{"question": "Question text", "options": ["Option 1", "Option 2", "Option 3", "Option 4"], "correct_answer": 0}]""",
-            allow_delegation=False
+            allow_delegation=False,
+            llm=self._build_llm(self.model_router.route("quiz_generator").primary)
+        )
+
+    def _build_llm(self, spec) -> LLM:
+        """Build (or reuse) the LLM client for a routed model spec."""
+        if spec not in self._llms:
+            self._llms[spec] = LLM(
+                model=spec.model,
+                base_url=spec.base_url,
+                api_key=spec.api_key,
+                timeout=spec.timeout
+            )
+        return self._llms[spec]
+
+    def _agent_for(self, role: str, spec):
+        """Build a fresh agent for a role, bound to the given model.
+
+        CrewAI agents keep per-run executor state, so concurrent kickoffs (API threads, job workers,
+        CLI batch) must not share one; the agents from setup_agents are only used as templates.
+        """
+        agent = getattr(self, role)
+        return Agent(
+            role=agent.role,
+            goal=agent.goal,
+            backstory=agent.backstory,
+            allow_delegation=False,
+            llm=self._build_llm(spec)
         )
 
+    def _kickoff(self, role: str, spec, task: Task):
+        agent = self._agent_for(role, spec)
+        task.agent = agent
+        crew = Crew(
+            agents=[agent],
+            tasks=[task],
+            process=Process.sequential
+        )
+
+        started = time.perf_counter()
+        try:
+            result = crew.kickoff()
+        except Exception:
+            self.model_router.record(role, spec, time.perf_counter() - started, error=True)
+            raise
+        usage = getattr(result, "token_usage", None) or getattr(crew, "usage_metrics", None)
+        self.model_router.record(role, spec, time.perf_counter() - started, usage=usage)
+        return result
+
+    def _run_crew(self, role: str, task: Task):
+        """Run a single-task crew for an agent role on the model the router picks for it.
+
+        If the primary model fails, the call is retried once on the role's fallback model.
+        """
+        spec = self.model_router.select(role)
+        try:
+            return self._kickoff(role, spec, task)
+        except Exception as e:
+            fallback = self.model_router.route(role).fallback
+            if fallback is None or spec == fallback:
+                raise
+            print(f"Model {spec.model} failed for {role} ({str(e)}), retrying on {fallback.model}")
+            return self._kickoff(role, fallback, task)
+
+    async def _achat(self, role: str, spec, messages: List[Dict]) -> str:
+        started = time.perf_counter()
+        try:
+            content, usage = await self.llm_client.chat(spec, messages)
+        except Exception:
+            self.model_router.record(role, spec, time.perf_counter() - started, error=True)
+            raise
+        self.model_router.record(role, spec, time.perf_counter() - started, usage=usage)
+        return content
+
+    async def _arun_task(self, role: str, task: Task) -> str:
+        """Async counterpart of _run_crew: send the agent's persona and the task straight to the routed model."""
+        agent = getattr(self, role)
+        messages = [
+            {"role": "system", "content": f"You are a {agent.role}. Your goal: {agent.goal}.\n{agent.backstory}"},
+            {"role": "user", "content": f"{task.description}\n\nExpected output: {task.expected_output}"}
+        ]
+        spec = self.model_router.select(role)
+        try:
+            return await self._achat(role, spec, messages)
+        except Exception as e:
+            fallback = self.model_router.route(role).fallback
+            if fallback is None or spec == fallback:
+                raise
+            print(f"Model {spec.model} failed for {role} ({str(e)}), retrying on {fallback.model}")
+            return await self._achat(role, fallback, messages)
+
     def parse_json_response(self, response: str) -> Dict:
         """Parse JSON from the agent's response, handling potential text before/after the JSON."""
         try:
@@ -104,9 +321,8 @@ class LeemboAI:
                     "raw_response": response
                 }
 
-    def assess_level(self, topic: str) -> Dict:
-        """Assess user's knowledge level and learning style for a given topic."""
-        task = Task(
+    def _assessment_task(self, topic: str) -> Task:
+        return Task(
             description=f"Assess the user's knowledge level and learning style for: {topic}. Return the result as a JSON string.",
             agent=self.level_assessor,
             expected_output="""A JSON string in the format:
@@ -115,249 +331,245 @@ class LeemboAI:
                 "style": "Visual/Auditory/Reading/Kinesthetic"
             }"""
         )
-        
-        crew = Crew(
-            agents=[self.level_assessor],
-            tasks=[task],
-            process=Process.sequential
-        )
-        
-        result = crew.kickoff()
+
+    def assess_level(self, topic: str) -> Dict:
+        """Assess user's knowledge level and learning style for a given topic."""
+        task = self._assessment_task(topic)
+        result = self._run_crew("level_assessor", task)
         # Get the last task result as that's our assessment
         return self.parse_json_response(str(result))
 
     def get_trending_topics(self, limit: int = 5, user_age: str = None, user_preferences: list = None) -> List[Dict]:
         """Get current trending educational topics using Tavily and LLM, personalized for the user."""
-        try:
-            # If user has preferences, prioritize them in the search
-            preference_context = ""
-            age_context = ""
-            
-            if user_preferences and len(user_preferences) > 0:
-                top_preferences = user_preferences  # Use top 3 preferences for search context
-                preference_context = f"related to {', '.join(top_preferences)}"
+        return self.trending_topics_result(limit, user_age, user_preferences)[0]
+
+    def _trending_query(self, user_age=None, user_preferences: list = None):
+        """Tavily query for trending topics plus the age context for the analyzer prompt."""
+        # If user has preferences, prioritize them in the search
+        preference_context = ""
+        age_context = ""
+        
+        if user_preferences and len(user_preferences) > 0:
+            top_preferences = user_preferences  # Use top 3 preferences for search context
+            preference_context = f"related to {', '.join(top_preferences)}"
+        
+        if user_age:
+            age = int(user_age) if isinstance(user_age, str) else user_age
+            if age < 13:
+                age_context = "for elementary school students"
+            elif age < 18:
+                age_context = "for teenagers and high school students"
+            # No modifier needed for adults
+        
+        # First, use Tavily to search for trending educational topics
+        search_query = "trending educational topics in technology, science, and humanities of today"
+        
+        # If we have user preferences, modify the search to prioritize them
+        if preference_context or age_context:
+            search_query = f"trending educational topics {preference_context} {age_context}"
+        return search_query, age_context
+
+    def _trending_task(self, search_results, limit: int, user_preferences: list, age_context: str) -> Task:
+        return Task(
+            description=f"""Analyze these search results and identify the top trending educational topics:
+            {search_results}
             
-            if user_age:
-                age = int(user_age) if isinstance(user_age, str) else user_age
-                if age < 13:
-                    age_context = "for elementary school students"
-                elif age < 18:
-                    age_context = "for teenagers and high school students"
-                # No modifier needed for adults
+            Consider topics from various domains such as technology, science, humanities, arts, and business also for children learning .
+            Focus on topics with educational value that people would want to learn about.
             
-            # First, use Tavily to search for trending educational topics
-            search_query = "trending educational topics in technology, science, and humanities of today"
+            {f"Prioritize topics related to the user's interests: {', '.join(user_preferences)}" if user_preferences and len(user_preferences) > 0 else ""}
+            {f"Ensure topics are appropriate for {age_context}" if age_context else ""}
             
-            # If we have user preferences, modify the search to prioritize them
-            if preference_context or age_context:
-                search_query = f"trending educational topics {preference_context} {age_context}"
+            Rank topics by their relevance and trendiness.
             
+            Return ONLY a JSON array with the top {limit} trending topics for learning:
+            [
+                {{
+                    "topic": "Full topic name as a learning subject",
+                    "category": "Technology/Science/Business/Humanities/Arts/Health/Other",
+                    "relevance_score": (1-10 integer),
+                    "preference_match": (boolean indicating if this relates to user preferences)
+                }}
+            ]""",
+            agent=self.trend_analyzer,
+            expected_output=f"A JSON array of {limit} trending educational topics"
+        )
+
+    def _rank_trending_topics(self, parsed_result, limit: int, user_preferences: list):
+        """Topic names from the analyzer's output ranked for the user, or None if the output is not a list."""
+        if not isinstance(parsed_result, list):
+            return None
+        parsed_result = [topic for topic in parsed_result if isinstance(topic, dict) and topic.get('topic')]
+
+        # Score every candidate against the user's interest vector in one pass
+        candidates = CandidateIndex(parsed_result, [str(topic['topic']) for topic in parsed_result])
+        match_scores = self.ranker.match_scores(candidates, user_preferences)
+        relevance_scores = np.array(
+            [self._safe_float(topic.get('relevance_score'), default=5) for topic in parsed_result], dtype=np.float32
+        )
+        for topic, match_score in zip(parsed_result, match_scores):
+            topic['preference_match'] = bool(match_score >= MATCH_THRESHOLD)
+
+        # Rank on a blend of LLM relevance and interest similarity, ties going to the closer interest match
+        scores = self.ranker.blend(relevance_scores, match_scores)
+        topics = [parsed_result[i] for i in top_k(scores, limit, tiebreak=match_scores)]
+        
+        # Format the topics for return - just return the topic names for simplicity
+        return [topic['topic'] for topic in topics]
+
+    def _fallback_trending_topics(self, limit: int, user_preferences: list) -> List[str]:
+        # Fallback topics if parsing fails - try to include user preferences if available
+        fallback_topics = [
+            "Latest developments in artificial intelligence",
+            "Climate change mitigation strategies",
+            "Quantum computing advancements",
+            "Space exploration breakthroughs",
+            "Biotechnology and genetic engineering",
+            "Blockchain applications beyond cryptocurrency",
+            "Sustainable energy technologies",
+            "Cybersecurity best practices"
+        ]
+        
+        # If we have user preferences, replace some fallback topics with preference-based topics
+        if user_preferences and len(user_preferences) > 0:
+            preference_topics = [f"Recent advances in {pref}" for pref in user_preferences[:3]]
+            # Replace some of the fallback topics with preference-based ones
+            for i, pref_topic in enumerate(preference_topics):
+                if i < len(fallback_topics):
+                    fallback_topics[i] = pref_topic
+        
+        return fallback_topics[:limit]
+
+    def trending_topics_result(self, limit: int = 5, user_age: str = None, user_preferences: list = None):
+        """Like get_trending_topics, but returns (topics, is_fallback) so callers can avoid caching fallback topics."""
+        try:
+            search_query, age_context = self._trending_query(user_age, user_preferences)
             search_results = self.tavily_client.search(
                 query=search_query,
                 search_depth="advanced"
             )
             
             # Then, use the trend analyzer agent to process and curate the results
-            task = Task(
-                description=f"""Analyze these search results and identify the top trending educational topics:
-                {search_results}
-                
-                Consider topics from various domains such as technology, science, humanities, arts, and business also for children learning .
-                Focus on topics with educational value that people would want to learn about.
-                
-                {f"Prioritize topics related to the user's interests: {', '.join(user_preferences)}" if user_preferences and len(user_preferences) > 0 else ""}
-                {f"Ensure topics are appropriate for {age_context}" if age_context else ""}
-                
-                Rank topics by their relevance and trendiness.
-                
-                Return ONLY a JSON array with the top {limit} trending topics for learning:
-                [
-                    {{
-                        "topic": "Full topic name as a learning subject",
-                        "category": "Technology/Science/Business/Humanities/Arts/Health/Other",
-                        "relevance_score": (1-10 integer),
-                        "preference_match": (boolean indicating if this relates to user preferences)
-                    }}
-                ]""",
-                agent=self.trend_analyzer,
-                expected_output=f"A JSON array of {limit} trending educational topics"
-            )
-            
-            crew = Crew(
-                agents=[self.trend_analyzer],
-                tasks=[task],
-                process=Process.sequential
-            )
-            
-            result = crew.kickoff()
-            parsed_result = self.parse_json_response(str(result))
-            
-            # Ensure we got a valid list of topics
-            if isinstance(parsed_result, list):
-                # If we have user preferences, boost topics that match preferences
-                if user_preferences and len(user_preferences) > 0:
-                    # Check each topic for relevance to preferences
-                    for topic in parsed_result:
-                        topic_name = topic.get('topic', '').lower()
-                        preference_match = False
-                        
-                        # Check if any user preference is related to this topic
-                        for pref in user_preferences:
-                            pref_lower = pref.lower()
-                            if pref_lower in topic_name or topic_name in pref_lower or any(word in topic_name for word in pref_lower.split()):
-                                preference_match = True
-                                # Boost the relevance score for preference matches
-                                topic['relevance_score'] = min(10, topic.get('relevance_score', 5) + 3)
-                                topic['preference_match'] = True
-                                break
-                        
-                        if not preference_match:
-                            topic['preference_match'] = False
-                
-                # Sort by relevance score (descending) and limit to requested number
-                topics = sorted(parsed_result, key=lambda x: x.get('relevance_score', 0), reverse=True)[:limit]
-                
-                # If we have user preferences but no matches in top results, ensure at least one preference is included
-                if user_preferences and len(user_preferences) > 0 and not any(topic.get('preference_match', False) for topic in topics) and len(topics) > 0:
-                    # Replace the last topic with a topic based on user preference
-                    pref_topic = {
-                        "topic": f"Latest developments in {user_preferences[0]}",
-                        "category": "User Interest",
-                        "relevance_score": 8,
-                        "preference_match": True
-                    }
-                    topics[-1] = pref_topic
-                
-                # Format the topics for return - just return the topic names for simplicity
-                formatted_topics = [topic['topic'] for topic in topics]
-                return formatted_topics
-            
-            # Fallback topics if parsing fails - try to include user preferences if available
-            fallback_topics = [
-                "Latest developments in artificial intelligence",
-                "Climate change mitigation strategies",
-                "Quantum computing advancements",
-                "Space exploration breakthroughs",
-                "Biotechnology and genetic engineering",
-                "Blockchain applications beyond cryptocurrency",
-                "Sustainable energy technologies",
-                "Cybersecurity best practices"
-            ]
-            
-            # If we have user preferences, replace some fallback topics with preference-based topics
-            if user_preferences and len(user_preferences) > 0:
-                preference_topics = [f"Recent advances in {pref}" for pref in user_preferences[:3]]
-                # Replace some of the fallback topics with preference-based ones
-                for i, pref_topic in enumerate(preference_topics):
-                    if i < len(fallback_topics):
-                        fallback_topics[i] = pref_topic
-            
-            return fallback_topics[:limit]
+            task = self._trending_task(search_results, limit, user_preferences, age_context)
+            result = self._run_crew("trend_analyzer", task)
+            topics = self._rank_trending_topics(self.parse_json_response(str(result)), limit, user_preferences)
+            if topics is not None:
+                return topics, False
+            return self._fallback_trending_topics(limit, user_preferences), True
         
         except Exception as e:
             print(f"Error in get_trending_topics: {str(e)}")
             # If error occurs, return basic fallback topics
-            return [
-                "Latest developments in technology",
-                "Scientific discoveries of the year",
-                "Historical events that shaped today",
-                "Mathematical concepts explained simply",
-                "Understanding world economics"
-            ][:limit]
+            return BASIC_TRENDING_TOPICS[:limit], True
         
     def get_recommended_courses(self, user_preferences=None, current_topic="", limit=4):
-            """Get recommended video courses based on user preferences and current topic.
+        """Get recommended video courses based on user preferences and current topic."""
+        return self.recommended_courses_result(user_preferences, current_topic, limit)[0]
+
+    def _courses_query(self, user_preferences=None, current_topic="") -> str:
+        # Create a search query based on preferences and current topic
+        search_query = "best video courses tutorials"
+        
+        if current_topic:
+            search_query = f"best {current_topic} video courses tutorials"
+        elif user_preferences and len(user_preferences) > 0:
+            # Use first 2 preferences if no current topic
+            top_preferences = user_preferences
+            search_query = f"best {' '.join(top_preferences)} video courses tutorials"
+        return search_query
+
+    def _courses_task(self, search_results, limit: int, user_preferences=None, current_topic="") -> Task:
+        return Task(
+            description=f"""Analyze these search results and identify the best video courses:
+            {search_results}
             
-            Args:
-                user_preferences: List of user's learning interests/preferences
-                current_topic: Current topic the user is exploring
-                limit: Maximum number of courses to return
-                
-            Returns:
-                List of course objects with details including title, platform, instructor, etc.
-            """
-            try:
-                # Create a search query based on preferences and current topic
-                search_query = "best video courses tutorials"
-                
-                if current_topic:
-                    search_query = f"best {current_topic} video courses tutorials"
-                elif user_preferences and len(user_preferences) > 0:
-                    # Use first 2 preferences if no current topic
-                    top_preferences = user_preferences
-                    search_query = f"best {' '.join(top_preferences)} video courses tutorials"
-                
-                # Use Tavily to search for courses
-                search_results = self.tavily_client.search(
-                    query=search_query,
-                    search_depth="advanced",
-                    include_domains=["youtube.com", "udemy.com", "coursera.org", "edx.org", "skillshare.com"]
-                )
-                
-                # Use the curator agent to process and format the results
-                task = Task(
-                    description=f"""Analyze these search results and identify the best video courses:
-                    {search_results}
-                    
-                    {"Focus on courses related to: " + current_topic if current_topic else ""}
-                    {"Also consider the user's interests: " + ", ".join(user_preferences) if user_preferences and len(user_preferences) > 0 else ""}
-                    
-                    Extract course information and return a JSON array with {limit} recommended video courses.
-                    For each course, include:
-                    - id: A unique identifier (string or number)
-                    - title: The course title
-                    - platform: Platform name (YouTube, Udemy, Coursera, etc.)
-                    - instructor: Name of instructor or organization
-                    - duration: Course duration (e.g., "2 hours", "8 weeks")
-                    - rating: A rating from 1.0 to 5.0
-                    - thumbnail: URL to course thumbnail image (use a placeholder if unavailable)
-                    - url: Direct URL to the course
-                    - tags: Array of relevant topic tags (3-5 tags)
-                    
-                    IMPORTANT: Return ONLY a valid JSON array, no additional text.
-                    """,
-                    agent=self.curator,
-                    expected_output=f"A JSON array of {limit} recommended video courses"
-                )
-                
-                crew = Crew(
-                    agents=[self.curator],
-                    tasks=[task],
-                    process=Process.sequential
-                )
-                
-                result = crew.kickoff()
-                parsed_result = self.parse_json_response(str(result))
-                
-                # Ensure we got valid course data
-                if isinstance(parsed_result, list) and len(parsed_result) > 0:
-                    # Validate and clean up course data
-                    valid_courses = []
-                    for course in parsed_result[:limit]:
-                        # Ensure all required fields exist
-                        if all(key in course for key in ['id', 'title', 'platform', 'url']):
-                            # Set defaults for any missing fields
-                            course_with_defaults = {
-                                'id': course.get('id', str(len(valid_courses) + 1)),
-                                'title': course.get('title', 'Untitled Course'),
-                                'platform': course.get('platform', 'Online'),
-                                'instructor': course.get('instructor', 'Unknown'),
-                                'duration': course.get('duration', 'Varies'),
-                                'rating': self._safe_float(course.get('rating'), default=4.5),
-                                'thumbnail': course.get('thumbnail', '/api/placeholder/400/225'),
-                                'url': course.get('url', ''),
-                                'tags': course.get('tags', ['Learning'])
-                            }
-                            valid_courses.append(course_with_defaults)
-                    
-                    return valid_courses
-                
-                # Fallback data if parsing fails
-                return self._get_fallback_courses(current_topic, user_preferences, limit)
-                
-            except Exception as e:
-                print(f"Error in get_recommended_courses: {str(e)}")
-                return self._get_fallback_courses(current_topic, user_preferences, limit)
+            {"Focus on courses related to: " + current_topic if current_topic else ""}
+            {"Also consider the user's interests: " + ", ".join(user_preferences) if user_preferences and len(user_preferences) > 0 else ""}
+            
+            Extract course information and return a JSON array with {limit} recommended video courses.
+            For each course, include:
+            - id: A unique identifier (string or number)
+            - title: The course title
+            - platform: Platform name (YouTube, Udemy, Coursera, etc.)
+            - instructor: Name of instructor or organization
+            - duration: Course duration (e.g., "2 hours", "8 weeks")
+            - rating: A rating from 1.0 to 5.0
+            - thumbnail: URL to course thumbnail image (use a placeholder if unavailable)
+            - url: Direct URL to the course
+            - tags: Array of relevant topic tags (3-5 tags)
+            
+            IMPORTANT: Return ONLY a valid JSON array, no additional text.
+            """,
+            agent=self.curator,
+            expected_output=f"A JSON array of {limit} recommended video courses"
+        )
+
+    def _valid_courses(self, parsed_result, limit: int) -> List[Dict]:
+        """Courses from the curator's output that have the required fields, with defaults for the rest."""
+        valid_courses = []
+        if not isinstance(parsed_result, list):
+            return valid_courses
+        for course in parsed_result[:limit]:
+            # Ensure all required fields exist
+            if all(key in course for key in ['id', 'title', 'platform', 'url']):
+                # Set defaults for any missing fields
+                course_with_defaults = {
+                    'id': course.get('id', str(len(valid_courses) + 1)),
+                    'title': course.get('title', 'Untitled Course'),
+                    'platform': course.get('platform', 'Online'),
+                    'instructor': course.get('instructor', 'Unknown'),
+                    'duration': course.get('duration', 'Varies'),
+                    'rating': self._safe_float(course.get('rating'), default=4.5),
+                    'thumbnail': course.get('thumbnail', THUMBNAIL_PLACEHOLDER),
+                    'url': course.get('url', ''),
+                    'tags': course.get('tags', ['Learning'])
+                }
+                valid_courses.append(course_with_defaults)
+        return valid_courses
+
+    def _enrich_courses(self, courses: List[Dict]) -> List[Dict]:
+        # Drop broken links and duplicate courses, and replace dead thumbnails
+        return self.resource_enricher.enrich_resources(
+            courses,
+            thumbnail_key='thumbnail',
+            thumbnail_placeholder=THUMBNAIL_PLACEHOLDER
+        )
+
+    def recommended_courses_result(self, user_preferences=None, current_topic="", limit=4):
+        """Get recommended video courses based on user preferences and current topic.
+        
+        Args:
+            user_preferences: List of user's learning interests/preferences
+            current_topic: Current topic the user is exploring
+            limit: Maximum number of courses to return
+            
+        Returns:
+            (courses, is_fallback): course objects with details including title, platform, instructor,
+            etc., and whether they came from the built-in fallback catalog.
+        """
+        try:
+            # Use Tavily to search for courses
+            search_results = self.tavily_client.search(
+                query=self._courses_query(user_preferences, current_topic),
+                search_depth="advanced",
+                include_domains=COURSE_DOMAINS
+            )
+            
+            # Use the curator agent to process and format the results
+            task = self._courses_task(search_results, limit, user_preferences, current_topic)
+            result = self._run_crew("curator", task)
+            valid_courses = self._valid_courses(self.parse_json_response(str(result)), limit)
+            if valid_courses:
+                valid_courses = self._enrich_courses(valid_courses)
+                if valid_courses:
+                    return valid_courses, False
+            
+            # Fallback data if parsing fails
+            return self._get_fallback_courses(current_topic, user_preferences, limit), True
+            
+        except Exception as e:
+            print(f"Error in get_recommended_courses: {str(e)}")
+            return self._get_fallback_courses(current_topic, user_preferences, limit), True
             
     def _safe_float(self, value, default=0.0):
         try:
@@ -366,126 +578,42 @@ class LeemboAI:
             return default
     def _get_fallback_courses(self, topic=None, preferences=None, limit=4):
         """Generate fallback course recommendations if API calls fail."""
-        fallback_courses = [
-            {
-                "id": "1",
-                "title": "Complete Machine Learning & Data Science Bootcamp",
-                "platform": "YouTube",
-                "instructor": "freeCodeCamp.org",
-                "duration": "11 hours",
-                "rating": 4.8,
-                "thumbnail": "https://i.ytimg.com/vi/cBBTWcHkVVY/hqdefault.jpg",
-                "url": "https://www.youtube.com/watch?v=cBBTWcHkVVY",
-                "tags": ["Machine Learning", "Data Science", "Python"]
-            },
-            {
-                "id": "2",
-                "title": "JavaScript Crash Course for Beginners",
-                "platform": "YouTube",
-                "instructor": "Traversy Media",
-                "duration": "1.5 hours",
-                "rating": 4.9,
-                "thumbnail": "https://i.ytimg.com/vi/hdI2bqOjy3c/hqdefault.jpg",
-                "url": "https://www.youtube.com/watch?v=hdI2bqOjy3c",
-                "tags": ["JavaScript", "Web Development", "Programming"]
-            },
-            {
-                "id": "3",
-                "title": "Modern React with Redux",
-                "platform": "Udemy",
-                "instructor": "Stephen Grider",
-                "duration": "52 hours",
-                "rating": 4.7,
-                "thumbnail": "/api/placeholder/400/220",
-                "url": "https://www.udemy.com/course/react-redux/",
-                "tags": ["React", "Redux", "Web Development"]
-            },
-            {
-                "id": "4",
-                "title": "Python for Everybody",
-                "platform": "Coursera",
-                "instructor": "University of Michigan",
-                "duration": "8 weeks",
-                "rating": 4.8,
-                "thumbnail": "/api/placeholder/400/220",
-                "url": "https://www.coursera.org/specializations/python",
-                "tags": ["Python", "Programming", "Computer Science"]
-            },
-            {
-                "id": "5",
-                "title": "The Web Developer Bootcamp",
-                "platform": "Udemy",
-                "instructor": "Colt Steele",
-                "duration": "63 hours",
-                "rating": 4.7,
-                "thumbnail": "/api/placeholder/400/220",
-                "url": "https://www.udemy.com/course/the-web-developer-bootcamp/",
-                "tags": ["Web Development", "HTML", "CSS", "JavaScript"]
-            },
-            {
-                "id": "6",
-                "title": "Introduction to Quantum Computing",
-                "platform": "edX",
-                "instructor": "MIT",
-                "duration": "6 weeks",
-                "rating": 4.6,
-                "thumbnail": "/api/placeholder/400/220",
-                "url": "https://www.edx.org/course/quantum-computing",
-                "tags": ["Quantum Computing", "Physics", "Computer Science"]
-            },
-            {
-                "id": "7",
-                "title": "Complete Digital Marketing Course",
-                "platform": "YouTube",
-                "instructor": "SimpliLearn",
-                "duration": "8 hours",
-                "rating": 4.5,
-                "thumbnail": "/api/placeholder/400/220",
-                "url": "https://www.youtube.com/watch?v=hD-SXLYgRZ0",
-                "tags": ["Digital Marketing", "SEO", "Social Media"]
-            },
-            {
-                "id": "8",
-                "title": "Introduction to Artificial Intelligence",
-                "platform": "Coursera",
-                "instructor": "Stanford University",
-                "duration": "11 weeks",
-                "rating": 4.8,
-                "thumbnail": "/api/placeholder/400/220",
-                "url": "https://www.coursera.org/learn/introduction-to-ai",
-                "tags": ["AI", "Machine Learning", "Computer Science"]
-            }
-        ]
-        
-        # If topic is provided, prioritize courses related to that topic
-        if topic:
-            topic_lower = topic.lower()
-            prioritized_courses = [
-                course for course in fallback_courses 
-                if topic_lower in course["title"].lower() or 
-                any(topic_lower in tag.lower() for tag in course["tags"])
-            ]
+        # Topic matches weigh twice as much as preference matches; ties go to the better-rated course
+        scores = self.ranker.score(self.fallback_course_index, preferences, query=topic or "")
+        if not scores.any():
+            return [dict(course) for course in FALLBACK_COURSES[:limit]]
+
+        # Only return courses that actually match
+        ratings = np.array([course["rating"] for course in FALLBACK_COURSES], dtype=np.float32)
+        return [dict(FALLBACK_COURSES[i]) for i in top_k(scores, min(limit, int(np.count_nonzero(scores))), tiebreak=ratings)]
+
+    def _resources_task(self, level: str, style: str, search_results) -> Task:
+        return Task(
+            description=f"""Curate and summarize these resources for {level} level learners who prefer {style} learning:
+            {search_results}
             
-            # If we found relevant courses, return them
-            if prioritized_courses:
-                return prioritized_courses[:limit]
-        
-        # If preferences are provided, prioritize courses related to preferences
-        if preferences and len(preferences) > 0:
-            for pref in preferences:
-                pref_lower = pref.lower()
-                prioritized_courses = [
-                    course for course in fallback_courses 
-                    if pref_lower in course["title"].lower() or 
-                    any(pref_lower in tag.lower() for tag in course["tags"])
-                ]
-                
-                # If we found relevant courses, return them
-                if prioritized_courses:
-                    return prioritized_courses[:limit]
-        
-        # If no specific matches, return the first 'limit' courses
-        return fallback_courses[:limit]
+            Return ONLY the JSON array with no additional text.
+            Format:
+            [
+                {{
+                    "title": "Resource Title",
+                    "url": "Resource URL",
+                    "summary": "Brief summary"
+                }}
+            ]""",
+            agent=self.curator,
+            expected_output="A JSON array of curated resources"
+        )
+
+    def _valid_resources(self, parsed_result) -> bool:
+        return isinstance(parsed_result, list) and len(parsed_result) > 0 and all(
+            isinstance(r, dict) and
+            "title" in r and
+            "url" in r and
+            "summary" in r
+            for r in parsed_result
+        )
+
     def curate_resources(self, topic: str, level: str, style: str) -> List[Dict]:
         """Search for and curate learning resources using Tavily."""
         max_retries = 3
@@ -495,121 +623,92 @@ class LeemboAI:
                 search_depth="advanced"
             )
             
-            task = Task(
-                description=f"""Curate and summarize these resources for {level} level learners who prefer {style} learning:
-                {search_results}
-                
-                Return ONLY the JSON array with no additional text.
-                Format:
-                [
-                    {{
-                        "title": "Resource Title",
-                        "url": "Resource URL",
-                        "summary": "Brief summary"
-                    }}
-                ]""",
-                agent=self.curator,
-                expected_output="A JSON array of curated resources"
-            )
-            
-            crew = Crew(
-                agents=[self.curator],
-                tasks=[task],
-                process=Process.sequential
-            )
-            
-            result = crew.kickoff()
+            task = self._resources_task(level, style, search_results)
+            result = self._run_crew("curator", task)
             parsed_result = self.parse_json_response(str(result))
             
             # Validate the resources structure
-            if isinstance(parsed_result, list) and len(parsed_result) > 0:
-                valid_resources = all(
-                    isinstance(r, dict) and
-                    "title" in r and
-                    "url" in r and
-                    "summary" in r
-                    for r in parsed_result
-                )
-                if valid_resources:
-                    return parsed_result
+            if self._valid_resources(parsed_result):
+                # Drop broken and duplicate links before handing them to the user; dropped links
+                # are not worth another search and LLM call
+                return self.resource_enricher.enrich_resources(parsed_result)
             
             print(f"Resource curation attempt {attempt + 1} failed, retrying...")
         
         # If all retries failed, return an empty list
         return []
 
-    def explain_topic(self, topic: str, level: str, style: str) -> str:
-        """Generate an explanation tailored to user's level and style."""
-        task = Task(
-            description=f"Explain {topic} for a {level} level learner who prefers {style} learning. Use markdown formatting.",
+    def _explanation_task(self, topic: str, level: str, style: str, brief: bool = False) -> Task:
+        description = f"Explain {topic} for a {level} level learner who prefers {style} learning. Use markdown formatting."
+        if brief:
+            description += " Keep it short: cover only the key ideas in under 200 words."
+        return Task(
+            description=description,
             agent=self.explainer,
             expected_output="A markdown-formatted explanation of the topic"
         )
-        
-        crew = Crew(
-            agents=[self.explainer],
-            tasks=[task],
-            process=Process.sequential
-        )
-        
-        result = crew.kickoff()
+
+    def explain_topic(self, topic: str, level: str, style: str, brief: bool = False) -> str:
+        """Generate an explanation tailored to user's level and style."""
+        task = self._explanation_task(topic, level, style, brief)
+        result = self._run_crew("explainer", task)
         return str(result)  # Return the explanation as is since it's just text
 
+    def _quiz_task(self, topic: str, level: str) -> Task:
+        return Task(
+            description=f"""Create a quiz about {topic} appropriate for {level} level learners.
+            Generate exactly 5 multiple-choice questions.
+            Each question must have exactly 4 options.
+            Return ONLY the JSON array with no additional text.
+            Format:
+            [
+                {{
+                    "question": "Question text",
+                    "options": ["Option 1", "Option 2", "Option 3", "Option 4"],
+                    "correct_answer": 0
+                }}
+            ]""",
+            agent=self.quiz_generator,
+            expected_output="A JSON array of 5 quiz questions"
+        )
+
+    def _valid_quiz(self, parsed_result) -> bool:
+        # Verify each question has the required structure
+        return isinstance(parsed_result, list) and len(parsed_result) > 0 and all(
+            isinstance(q, dict) and
+            "question" in q and
+            "options" in q and
+            "correct_answer" in q and
+            isinstance(q["options"], list) and
+            len(q["options"]) == 4
+            for q in parsed_result
+        )
+
+    def _default_quiz(self, topic: str) -> List[Dict]:
+        return [
+            {
+                "question": f"Basic question about {topic}?",
+                "options": ["Option 1", "Option 2", "Option 3", "Option 4"],
+                "correct_answer": 0
+            }
+        ]
+
     def generate_quiz(self, topic: str, level: str) -> List[Dict]:
         """Generate a quiz based on the topic and user's level."""
         max_retries = 3
         for attempt in range(max_retries):
-            task = Task(
-                description=f"""Create a quiz about {topic} appropriate for {level} level learners.
-                Generate exactly 5 multiple-choice questions.
-                Each question must have exactly 4 options.
-                Return ONLY the JSON array with no additional text.
-                Format:
-                [
-                    {{
-                        "question": "Question text",
-                        "options": ["Option 1", "Option 2", "Option 3", "Option 4"],
-                        "correct_answer": 0
-                    }}
-                ]""",
-                agent=self.quiz_generator,
-                expected_output="A JSON array of 5 quiz questions"
-            )
-            
-            crew = Crew(
-                agents=[self.quiz_generator],
-                tasks=[task],
-                process=Process.sequential
-            )
-            
-            result = crew.kickoff()
+            task = self._quiz_task(topic, level)
+            result = self._run_crew("quiz_generator", task)
             parsed_result = self.parse_json_response(str(result))
             
             # Validate the quiz structure
-            if isinstance(parsed_result, list) and len(parsed_result) > 0:
-                # Verify each question has the required structure
-                valid_quiz = all(
-                    isinstance(q, dict) and
-                    "question" in q and
-                    "options" in q and
-                    "correct_answer" in q and
-                    isinstance(q["options"], list) and
-                    len(q["options"]) == 4
-                    for q in parsed_result
-                )
-                if valid_quiz:
-                    return parsed_result
+            if self._valid_quiz(parsed_result):
+                return parsed_result
             
             print(f"Quiz generation attempt {attempt + 1} failed, retrying...")
         
         # If all retries failed, return a default quiz
-        return [
-            {
-                "question": f"Basic question about {topic}?",
-                "options": ["Option 1", "Option 2", "Option 3", "Option 4"],
-                "correct_answer": 0
-            }
-        ]
+        return self._default_quiz(topic)
 
     def reset_session(self):
         """Reset the current learning session."""
@@ -634,50 +733,297 @@ class LeemboAI:
                 'assessment': {"level": "Beginner", "style": "Visual"}
             }
 
-    def continue_with_assessment(self, topic: str, approved_assessment: dict):
+    def fallback_stages(self, topic: str, package: Dict) -> List[str]:
+        """Names of the stages in a package that hold fallback output instead of a real result.
+
+        Curation returns no resources and quiz generation returns the placeholder quiz once their
+        retries run out; such packages are served but never cached.
+        """
+        fallbacks = []
+        if not package.get('resources'):
+            fallbacks.append('resources')
+        if not str(package.get('explanation') or '').strip():
+            fallbacks.append('explanation')
+        if not package.get('quiz') or package.get('quiz') == self._default_quiz(topic):
+            fallbacks.append('quiz')
+        return fallbacks
+
+    def _degraded_stages(self, topic: str, tier: str) -> Dict:
+        """Stage results substituted without any LLM or search calls at a degraded service tier."""
+        if tier == REDUCED:
+            return {'resources': []}
+        if tier == MINIMAL:
+            return {'resources': [], 'quiz': self._default_quiz(topic)}
+        return {}
+
+    def run_learning_stages(self, topic: str, level: str, style: str, completed: dict = None, on_stage=None,
+                            tier: str = FULL) -> Dict:
+        """Run the resources, explanation and quiz stages concurrently, skipping any already in `completed`.
+
+        `on_stage(name, value)` is called as each stage finishes so callers can checkpoint it.
+        If a stage fails, the others still finish (and are checkpointed) before the error is raised.
+        A degraded `tier` skips resource curation (reduced) or also shortens the explanation and uses
+        the fallback quiz (minimal).
+        """
+        results = dict(self._degraded_stages(topic, tier), **(completed or {}))
+        stages = {
+            'resources': lambda: self.curate_resources(topic, level, style),
+            'explanation': lambda: self.explain_topic(topic, level, style, brief=tier == MINIMAL),
+            'quiz': lambda: self.generate_quiz(topic, level)
+        }
+        pending = {name: stage for name, stage in stages.items() if name not in results}
+        if not pending:
+            return results
+
+        errors = []
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            # Each stage runs in a copy of the caller's context so usage tags follow it into the pool
+            futures = {executor.submit(contextvars.copy_context().run, stage): name for name, stage in pending.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                if on_stage is not None:
+                    on_stage(name, results[name])
+
+        if errors:
+            raise errors[0]
+        return results
+
+    def build_learning_package(self, topic: str, assessment: dict, source: str = "api", tier: str = FULL) -> Dict:
+        """Build the complete learning package for an assessment, reusing the on-disk package cache.
+
+        Unlike continue_with_assessment this raises on failure and does not touch the current session,
+        so it is safe to call from several threads at once. Only packages built at the full tier with no
+        fallback stages are cached. At a degraded `tier` the package is built with fewer stages; at the
+        cache_only tier a cache miss raises OverloadedError.
+        The returned package records the tier it was served at in `service_tier`.
+        """
+        # The assessment comes straight from the client, so level/style may be missing, null or not strings
+        level = str(assessment.get('level') or 'Beginner')
+        style = str(assessment.get('style') or 'Visual')
+
+        package = self.package_cache.get(topic, level, style)
+        if package is not None:
+            return dict(package, topic=topic, assessment=assessment, service_tier=FULL, cached=True)
+        if tier == CACHE_ONLY:
+            raise OverloadedError()
+
+        stages = self.run_learning_stages(topic, level, style, tier=tier)
+        package = {
+            'topic': topic,
+            'assessment': assessment,
+            'resources': stages['resources'],
+            'explanation': stages['explanation'],
+            'quiz': stages['quiz']
+        }
+        if tier == FULL and not self.fallback_stages(topic, package):
+            self.package_cache.set(topic, level, style, package, source=source)
+        return dict(package, service_tier=tier, cached=False)
+
+    def _error_package(self, topic: str, assessment: dict) -> Dict:
+        return {
+            'topic': topic,
+            'assessment': assessment,
+            'resources': [],
+            'explanation': "Sorry, I encountered an error while preparing your learning materials.",
+            'quiz': [],
+            'service_tier': ERROR,
+            'cached': False
+        }
+
+    def continue_with_assessment(self, topic: str, approved_assessment: dict, tier: str = FULL):
         """Continue the learning process with the approved assessment."""
         try:
             # Store the current topic and assessment
             self.current_session['topic'] = topic
             self.current_session['assessment'] = approved_assessment
-            
-            level = approved_assessment.get('level', 'Beginner')
-            style = approved_assessment.get('style', 'Visual')
-
-            # 2. Curate resources
-            resources = self.curate_resources(topic, level, style)
-            self.current_session['resources'] = resources
 
-            # 3. Generate initial explanation
-            explanation = self.explain_topic(topic, level, style)
-            self.current_session['explanation'] = explanation
-
-            # 4. Create quiz
-            quiz = self.generate_quiz(topic, level)
-            self.current_session['quiz'] = quiz
+            # 2-4. Curate resources, explain the topic and create the quiz concurrently (or reuse a cached package)
+            package = self.build_learning_package(topic, approved_assessment, tier=tier)
+            self.current_session['resources'] = package['resources']
+            self.current_session['explanation'] = package['explanation']
+            self.current_session['quiz'] = package['quiz']
 
             # Clear pending assessment
             self.pending_assessment = None
 
             # Return the complete learning package
-            return {
-                'topic': topic,
-                'assessment': approved_assessment,
-                'resources': resources,
-                'explanation': explanation,
-                'quiz': quiz
-            }
-            
+            return package
+
+        except OverloadedError:
+            raise
         except Exception as e:
             print(f"Error in continue_with_assessment: {str(e)}")
+            return self._error_package(topic, approved_assessment)
+
+    async def aassess_level(self, topic: str) -> Dict:
+        """Async version of assess_level."""
+        result = await self._arun_task("level_assessor", self._assessment_task(topic))
+        return self.parse_json_response(result)
+
+    async def acurate_resources(self, topic: str, level: str, style: str) -> List[Dict]:
+        """Async version of curate_resources."""
+        max_retries = 3
+        for attempt in range(max_retries):
+            search_results = await self.async_tavily_client.search(
+                query=f"{topic} {level} level learning resources {style}",
+                search_depth="advanced"
+            )
+            result = await self._arun_task("curator", self._resources_task(level, style, search_results))
+            parsed_result = self.parse_json_response(result)
+
+            if self._valid_resources(parsed_result):
+                return await asyncio.to_thread(self.resource_enricher.enrich_resources, parsed_result)
+
+            print(f"Resource curation attempt {attempt + 1} failed, retrying...")
+
+        return []
+
+    async def aexplain_topic(self, topic: str, level: str, style: str, brief: bool = False) -> str:
+        """Async version of explain_topic."""
+        return await self._arun_task("explainer", self._explanation_task(topic, level, style, brief))
+
+    async def agenerate_quiz(self, topic: str, level: str) -> List[Dict]:
+        """Async version of generate_quiz."""
+        max_retries = 3
+        for attempt in range(max_retries):
+            result = await self._arun_task("quiz_generator", self._quiz_task(topic, level))
+            parsed_result = self.parse_json_response(result)
+            if self._valid_quiz(parsed_result):
+                return parsed_result
+
+            print(f"Quiz generation attempt {attempt + 1} failed, retrying...")
+
+        return self._default_quiz(topic)
+
+    async def aget_initial_assessment(self, topic: str):
+        """Async version of get_initial_assessment."""
+        try:
+            assessment = await self.aassess_level(topic)
+            if not isinstance(assessment, dict) or "error" in assessment:
+                assessment = {"level": "Beginner", "style": "Visual"}
+            return {'topic': topic, 'assessment': assessment}
+        except Exception as e:
+            print(f"Error in aget_initial_assessment: {str(e)}")
             return {
                 'topic': topic,
-                'assessment': approved_assessment,
-                'resources': [],
-                'explanation': "Sorry, I encountered an error while preparing your learning materials.",
-                'quiz': []
+                'assessment': {"level": "Beginner", "style": "Visual"}
             }
 
+    async def arun_learning_stages(self, topic: str, level: str, style: str, completed: dict = None, on_stage=None,
+                                   tier: str = FULL) -> Dict:
+        """Async version of run_learning_stages; the stages run concurrently on the event loop."""
+        results = dict(self._degraded_stages(topic, tier), **(completed or {}))
+        stages = {
+            'resources': lambda: self.acurate_resources(topic, level, style),
+            'explanation': lambda: self.aexplain_topic(topic, level, style, brief=tier == MINIMAL),
+            'quiz': lambda: self.agenerate_quiz(topic, level)
+        }
+
+        async def run(name, stage):
+            return name, await stage()
+
+        errors = []
+        pending = [run(name, stage) for name, stage in stages.items() if name not in results]
+        for next_done in asyncio.as_completed(pending):
+            try:
+                name, value = await next_done
+            except Exception as e:
+                errors.append(e)
+                continue
+            results[name] = value
+            if on_stage is not None:
+                on_stage(name, value)
+
+        if errors:
+            raise errors[0]
+        return results
+
+    async def abuild_learning_package(self, topic: str, assessment: dict, source: str = "api", tier: str = FULL) -> Dict:
+        """Async version of build_learning_package."""
+        # The assessment comes straight from the client, so level/style may be missing, null or not strings
+        level = str(assessment.get('level') or 'Beginner')
+        style = str(assessment.get('style') or 'Visual')
+
+        package = await asyncio.to_thread(self.package_cache.get, topic, level, style)
+        if package is not None:
+            return dict(package, topic=topic, assessment=assessment, service_tier=FULL, cached=True)
+        if tier == CACHE_ONLY:
+            raise OverloadedError()
+
+        stages = await self.arun_learning_stages(topic, level, style, tier=tier)
+        package = {
+            'topic': topic,
+            'assessment': assessment,
+            'resources': stages['resources'],
+            'explanation': stages['explanation'],
+            'quiz': stages['quiz']
+        }
+        if tier == FULL and not self.fallback_stages(topic, package):
+            await asyncio.to_thread(self.package_cache.set, topic, level, style, package, source)
+        return dict(package, service_tier=tier, cached=False)
+
+    async def acontinue_with_assessment(self, topic: str, approved_assessment: dict, tier: str = FULL):
+        """Async version of continue_with_assessment."""
+        try:
+            return await self.abuild_learning_package(topic, approved_assessment, tier=tier)
+        except OverloadedError:
+            raise
+        except Exception as e:
+            print(f"Error in acontinue_with_assessment: {str(e)}")
+            return self._error_package(topic, approved_assessment)
+
+    async def atrending_topics_result(self, limit: int = 5, user_age: str = None, user_preferences: list = None):
+        """Async version of trending_topics_result."""
+        try:
+            search_query, age_context = self._trending_query(user_age, user_preferences)
+            search_results = await self.async_tavily_client.search(query=search_query, search_depth="advanced")
+            task = self._trending_task(search_results, limit, user_preferences, age_context)
+            result = await self._arun_task("trend_analyzer", task)
+            topics = self._rank_trending_topics(self.parse_json_response(result), limit, user_preferences)
+            if topics is not None:
+                return topics, False
+            return self._fallback_trending_topics(limit, user_preferences), True
+        except Exception as e:
+            print(f"Error in atrending_topics_result: {str(e)}")
+            return BASIC_TRENDING_TOPICS[:limit], True
+
+    async def arecommended_courses_result(self, user_preferences=None, current_topic="", limit=4):
+        """Async version of recommended_courses_result."""
+        try:
+            search_results = await self.async_tavily_client.search(
+                query=self._courses_query(user_preferences, current_topic),
+                search_depth="advanced",
+                include_domains=COURSE_DOMAINS
+            )
+            task = self._courses_task(search_results, limit, user_preferences, current_topic)
+            result = await self._arun_task("curator", task)
+            valid_courses = self._valid_courses(self.parse_json_response(result), limit)
+            if valid_courses:
+                valid_courses = await asyncio.to_thread(self._enrich_courses, valid_courses)
+                if valid_courses:
+                    return valid_courses, False
+            return self._get_fallback_courses(current_topic, user_preferences, limit), True
+        except Exception as e:
+            print(f"Error in arecommended_courses_result: {str(e)}")
+            return self._get_fallback_courses(current_topic, user_preferences, limit), True
+
+    def io_stats(self) -> Dict:
+        """Request and connection-reuse counters for the pooled async clients."""
+        return {
+            "tavily": self.async_tavily_client.stats.snapshot(),
+            "llm": self.llm_client.stats.snapshot()
+        }
+
+    async def aclose(self):
+        """Close the pooled async clients."""
+        await self.async_tavily_client.aclose()
+        await self.llm_client.aclose()
+
     def get_current_session(self) -> dict:
         """Get the current learning session data."""
         return self.current_session
@@ -1,9 +1,18 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import hashlib
+import json
+import os
+import time
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 from LeemboAI import LeemboAI
-from typing import List
+from ttl_cache import TTLCache
+from job_queue import JobStore, JobWorkerPool, IdempotencyConflict, TERMINAL_STATUSES
+from cache_warmer import CacheWarmer, DemandLog
+from load_shedding import LoadMonitor, OverloadedError, FULL, MINIMAL, CACHE_ONLY
 
 app = FastAPI(title="EduMentor AI API")
 
@@ -14,11 +23,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Cache-Control"],
 )
 
 # Initialize EduMentor AI
 mentor = LeemboAI()
 
+# Serve /api/assess, /api/learn and the sidebar endpoints through the pooled async Tavily/LLM clients instead of CrewAI
+ASYNC_IO = os.getenv("LEEMBO_ASYNC_IO", "false").lower() in ("1", "true", "yes")
+
+# Durable background jobs for long generations
+job_store = JobStore()
+job_workers = JobWorkerPool(job_store, mentor, workers=int(os.getenv("JOB_WORKERS", "2")))
+
+# Live generation requests and queued jobs drive the service tier; the cache warmer backs off while any are running
+GENERATION_PATHS = {"/api/assess", "/api/learn", "/api/jobs"}
+load_monitor = LoadMonitor(queue_depth=job_store.queue_depth)
+
+# Cache warming from trending topics and historical demand
+demand_log = DemandLog(mentor.package_cache.cache_dir)
+cache_warmer = CacheWarmer(mentor, demand_log, is_busy=load_monitor.is_busy)
+
+# Server-side caches for the read-only sidebar endpoints, keyed on normalized request parameters
+TRENDING_TOPICS_TTL = int(os.getenv("TRENDING_TOPICS_TTL", "1800"))
+RECOMMENDED_COURSES_TTL = int(os.getenv("RECOMMENDED_COURSES_TTL", "3600"))
+CLIENT_MAX_AGE = int(os.getenv("CLIENT_CACHE_MAX_AGE", "300"))
+# Upper bound on sidebar `limit`, which goes into the LLM prompt and the cache key
+MAX_SIDEBAR_LIMIT = 20
+trending_topics_cache = TTLCache(ttl=TRENDING_TOPICS_TTL, max_entries=2000)
+recommended_courses_cache = TTLCache(ttl=RECOMMENDED_COURSES_TTL, max_entries=2000)
+# Sidebar lookups in progress, so concurrent misses for one cache key share a single upstream lookup
+inflight_payloads = {}
+
 class TopicRequest(BaseModel):
     topic: str
 
@@ -27,7 +63,7 @@ class AssessmentRequest(BaseModel):
     assessment: Dict
 
 class TrendingTopicsRequest(BaseModel):
-    limit: int
+    limit: int = Field(..., ge=1, le=MAX_SIDEBAR_LIMIT)
     user_age: int = Field(..., alias="userAge")
     user_preferences: List[str] = Field(..., alias="userPreferences")
 
@@ -37,6 +73,7 @@ class TrendingTopicsRequest(BaseModel):
 class AssessmentResponse(BaseModel):
     topic: str
     assessment: Dict
+    service_tier: str = FULL
 
 class TrendingTopicsResponse(BaseModel):
     topics: List[str]
@@ -47,11 +84,21 @@ class LearningResponse(BaseModel):
     resources: List[Dict]
     explanation: str
     quiz: List[Dict]
+    service_tier: str = FULL
+    cached: bool = False
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    stages_completed: List[str]
+    attempts: int
+    result: Optional[LearningResponse] = None
+    error: Optional[str] = None
 
 class RecommendedCoursesRequest(BaseModel):
     userPreferences: List[str] = Field(default=[])
     currentTopic: str = Field(default="")
-    limit: int = Field(default=4)
+    limit: int = Field(default=4, ge=1, le=MAX_SIDEBAR_LIMIT)
 
 class CourseResponse(BaseModel):
     id: str
@@ -66,35 +113,256 @@ class CourseResponse(BaseModel):
 
 class RecommendedCoursesResponse(BaseModel):
     courses: List[CourseResponse]
-    
+
+def _job_response(job: Dict) -> Dict:
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "stages_completed": sorted(job["checkpoints"]),
+        "attempts": job["attempts"],
+        "result": job["result"],
+        "error": job["error"]
+    }
+
+def _normalize_preferences(preferences: Optional[List[str]]) -> List[str]:
+    """Deduplicate preferences case-insensitively and sort them so equivalent requests share a cache key."""
+    unique = {}
+    for pref in preferences or []:
+        pref = pref.strip()
+        if pref and pref.lower() not in unique:
+            unique[pref.lower()] = pref
+    return [unique[key] for key in sorted(unique)]
+
+def _age_group(user_age) -> str:
+    """Collapse an age into the groups get_trending_topics actually distinguishes."""
+    try:
+        age = int(user_age)
+    except (TypeError, ValueError):
+        return ""
+    if age < 13:
+        return "child"
+    if age < 18:
+        return "teen"
+    return "adult"
+
+def _representative_age(age_group: str):
+    return {"child": 10, "teen": 15, "adult": 30}.get(age_group)
+
+def _wants_fresh(request: Request) -> bool:
+    """Whether the client asked to bypass caches (e.g. a Refresh button) with Cache-Control/Pragma no-cache."""
+    directives = f"{request.headers.get('cache-control', '')},{request.headers.get('pragma', '')}".lower()
+    return "no-cache" in directives or "no-store" in directives
+
+async def _cached_payload(cache: TTLCache, key: str, compute, force: bool = False):
+    """Return (payload, etag, cacheable) for key, computing the payload on a miss or when forced.
+
+    `compute` is a coroutine function returning (payload, is_fallback); fallback payloads are served
+    but never cached, so a transient upstream failure is not pinned for the whole TTL.
+    """
+    entry = None if force else cache.get(key)
+    if entry is not None:
+        return entry + (True,)
+
+    # A forced refresh may join a lookup already in flight; that result is just as fresh
+    task = inflight_payloads.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_compute_payload(cache, key, compute))
+        inflight_payloads[key] = task
+        task.add_done_callback(lambda t, key=key: inflight_payloads.pop(key, None))
+    # Shielded so one client disconnecting does not cancel the lookup for the others
+    return await asyncio.shield(task)
+
+async def _compute_payload(cache: TTLCache, key: str, compute):
+    payload, is_fallback = await compute()
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    entry = (payload, '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"')
+    if not is_fallback:
+        cache.set(key, entry)
+    return entry + (not is_fallback,)
+
+def _conditional_response(request: Request, payload: Dict, etag: str, cacheable: bool = True) -> Response:
+    """Serve payload with ETag/Cache-Control headers, or a 304 if the client already has it."""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={CLIENT_MAX_AGE}" if cacheable else "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {tag.strip()[2:] if tag.strip().startswith("W/") else tag.strip() for tag in if_none_match.split(",")}
+    if etag in client_etags or "*" in client_etags:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=json.dumps(payload),
+        media_type="application/json",
+        headers=headers
+    )
+
+async def _trending_topics(limit: int, user_age, user_preferences: List[str], force: bool = False):
+    preferences = _normalize_preferences(user_preferences)
+    age_group = _age_group(user_age)
+    key = json.dumps(["trending_topics", limit, age_group, [p.lower() for p in preferences]])
+
+    async def compute():
+        if ASYNC_IO:
+            topics, is_fallback = await mentor.atrending_topics_result(
+                limit, _representative_age(age_group), preferences
+            )
+        else:
+            topics, is_fallback = await asyncio.to_thread(
+                mentor.trending_topics_result, limit, _representative_age(age_group), preferences
+            )
+        return {"topics": topics}, is_fallback
+
+    return await _cached_payload(trending_topics_cache, key, compute, force)
+
+async def _recommended_courses(user_preferences: List[str], current_topic: str, limit: int, force: bool = False):
+    preferences = _normalize_preferences(user_preferences)
+    current_topic = current_topic.strip()
+    key = json.dumps(["recommended_courses", limit, current_topic.lower(), [p.lower() for p in preferences]])
+
+    async def compute():
+        if ASYNC_IO:
+            courses, is_fallback = await mentor.arecommended_courses_result(preferences, current_topic, limit)
+        else:
+            courses, is_fallback = await asyncio.to_thread(
+                mentor.recommended_courses_result, preferences, current_topic, limit
+            )
+        return {"courses": courses}, is_fallback
+
+    return await _cached_payload(recommended_courses_cache, key, compute, force)
+
+@app.middleware("http")
+async def track_live_generations(request: Request, call_next):
+    if request.method != "POST" or request.url.path not in GENERATION_PATHS:
+        return await call_next(request)
+    load_monitor.begin()
+    started = time.perf_counter()
+    latency = None
+    try:
+        response = await call_next(request)
+        # Only served learning packages count towards the latency window; shed requests would drag it down
+        if request.url.path == "/api/learn" and response.status_code < 500:
+            latency = time.perf_counter() - started
+        return response
+    finally:
+        load_monitor.end(latency)
+
+@app.on_event("startup")
+async def start_background_workers():
+    # Count jobs left queued by a previous run from the first request on
+    await asyncio.to_thread(load_monitor.refresh_queue_depth)
+    job_workers.start()
+    if os.getenv("CACHE_WARM_ENABLED", "false").lower() in ("1", "true", "yes"):
+        cache_warmer.start()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    cache_warmer.stop()
+    job_workers.stop()
+    await mentor.aclose()
+
 @app.post("/api/assess", response_model=AssessmentResponse)
 async def get_assessment(request: TopicRequest):
     """Get initial assessment for user approval."""
     try:
-        result = mentor.get_initial_assessment(request.topic)
+        tier = load_monitor.tier()
+        if tier in (MINIMAL, CACHE_ONLY):
+            # Under heavy load skip the assessor; the user reviews and can adjust the default anyway
+            return {"topic": request.topic, "assessment": {"level": "Beginner", "style": "Visual"}, "service_tier": tier}
+        if ASYNC_IO:
+            return await mentor.aget_initial_assessment(request.topic)
+        result = await asyncio.to_thread(mentor.get_initial_assessment, request.topic)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/learn", response_model=LearningResponse)
 async def continue_learning(request: AssessmentRequest):
-    """Continue learning process with approved assessment."""
+    """Continue learning process with approved assessment.
+
+    The service tier is picked from current load; the response's `service_tier` says which one was served
+    (`error` if generation failed).
+    While only cached packages are being served, a cache miss returns 503 with Retry-After.
+    """
     try:
-        result = mentor.continue_with_assessment(request.topic, request.assessment)
+        demand_log.record(request.topic, request.assessment.get("level"), request.assessment.get("style"))
+        tier = load_monitor.tier()
+        if ASYNC_IO:
+            result = await mentor.acontinue_with_assessment(request.topic, request.assessment, tier=tier)
+        else:
+            result = await asyncio.to_thread(mentor.continue_with_assessment, request.topic, request.assessment, tier)
+        load_monitor.record_served(result.get("service_tier", FULL), result.get("cached", False))
         return result
+    except OverloadedError as e:
+        load_monitor.record_rejected()
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/jobs", response_model=JobResponse, status_code=202)
+async def submit_learning_job(request: AssessmentRequest, idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key")):
+    """Queue a learning package generation and return its job ID immediately.
+
+    Resubmitting with the same Idempotency-Key returns the existing job instead of starting over;
+    reusing a key for a different topic or assessment returns 409.
+    """
+    try:
+        job, created = await asyncio.to_thread(job_store.submit, request.topic, request.assessment, idempotency_key)
+        if created:
+            demand_log.record(request.topic, request.assessment.get("level"), request.assessment.get("style"))
+        return _job_response(job)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_learning_job(job_id: str):
+    """Poll the status of a learning package job."""
+    job = await asyncio.to_thread(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_learning_job(job_id: str):
+    """Subscribe to a job's progress as server-sent events until it finishes."""
+    if await asyncio.to_thread(job_store.get, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last_state = None
+        while True:
+            job = await asyncio.to_thread(job_store.get, job_id)
+            state = (job["status"], tuple(sorted(job["checkpoints"])))
+            if state != last_state:
+                last_state = state
+                yield f"event: {job['status']}\ndata: {json.dumps(_job_response(job))}\n\n"
+            if job["status"] in TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(1)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.post("/api/trending_topics", response_model=TrendingTopicsResponse)
 async def get_trending_topics(request: TrendingTopicsRequest):
     """Get trending educational topics based on user age and preferences."""
     try:
-        topics = mentor.get_trending_topics(
-            limit=request.limit,
-            user_age=request.user_age,  # ✅ snake_case here
-            user_preferences=request.user_preferences  # ✅ snake_case here
-        )
-        return {"topics": topics}
+        payload, _, _ = await _trending_topics(request.limit, request.user_age, request.user_preferences)
+        return payload
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/trending_topics", response_model=TrendingTopicsResponse)
+async def get_trending_topics_cached(
+    request: Request,
+    limit: int = Query(default=5, ge=1, le=MAX_SIDEBAR_LIMIT),
+    user_age: str = Query(default="", alias="userAge"),
+    user_preferences: List[str] = Query(default=[], alias="userPreferences")
+):
+    """Cacheable GET variant of trending topics, with ETag and 304 support.
+
+    Send `Cache-Control: no-cache` to bypass the server-side cache and fetch fresh topics.
+    """
+    try:
+        payload, etag, cacheable = await _trending_topics(limit, user_age, user_preferences, _wants_fresh(request))
+        return _conditional_response(request, payload, etag, cacheable)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -102,15 +370,48 @@ async def get_trending_topics(request: TrendingTopicsRequest):
 async def get_recommended_courses(request: RecommendedCoursesRequest):
     """Get recommended video courses based on user preferences and current topic."""
     try:
-        courses = mentor.get_recommended_courses(
-            user_preferences=request.userPreferences,
-            current_topic=request.currentTopic,
-            limit=request.limit
-        )
-        return {"courses": courses}
+        payload, _, _ = await _recommended_courses(request.userPreferences, request.currentTopic, request.limit)
+        return payload
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/recommended_courses", response_model=RecommendedCoursesResponse)
+async def get_recommended_courses_cached(
+    request: Request,
+    limit: int = Query(default=4, ge=1, le=MAX_SIDEBAR_LIMIT),
+    current_topic: str = Query(default="", alias="currentTopic"),
+    user_preferences: List[str] = Query(default=[], alias="userPreferences")
+):
+    """Cacheable GET variant of recommended courses, with ETag and 304 support.
+
+    Send `Cache-Control: no-cache` to bypass the server-side cache and fetch fresh courses.
+    """
+    try:
+        payload, etag, cacheable = await _recommended_courses(user_preferences, current_topic, limit, _wants_fresh(request))
+        return _conditional_response(request, payload, etag, cacheable)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/cache_warmer/stats")
+async def get_cache_warmer_stats():
+    """Package cache hit ratios, warm-hit ratio and the last warming run's report."""
+    return cache_warmer.stats()
+
+@app.get("/api/load")
+async def get_load():
+    """Current tier and load signals, thresholds, and how many learning packages were served at each tier."""
+    return load_monitor.snapshot()
+
+@app.get("/api/io_stats")
+async def get_io_stats():
+    """Request counts and connection reuse for the pooled async Tavily and LLM clients."""
+    return mentor.io_stats()
+
+@app.get("/api/model_metrics")
+async def get_model_metrics():
+    """Per-role model routing state with latency and token metrics."""
+    return mentor.model_router.metrics()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,161 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_TAVILY_BASE_URL = "https://api.tavily.com"
+DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+
+class ConnectionStats:
+    """Counts requests against new TCP connections and TLS handshakes, to measure connection reuse."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self._lock = threading.Lock()
+
+    async def trace(self, event_name: str, info: Dict):
+        # httpcore reports connection lifecycle events through the "trace" request extension
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    def record(self, seconds: float, error: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.total_seconds += seconds
+            if error:
+                self.errors += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "connections_opened": self.connections_opened,
+                "tls_handshakes": self.tls_handshakes,
+                "connection_reuse_ratio": round(1 - self.connections_opened / self.requests, 3) if self.requests else 0.0,
+                "avg_latency": round(self.total_seconds / self.requests, 3) if self.requests else 0.0,
+            }
+
+
+def build_async_client(base_url: str, max_connections: int = None, max_keepalive: int = None,
+                       keepalive_expiry: float = None, timeout: float = None, connect_timeout: float = None,
+                       http2: bool = None) -> httpx.AsyncClient:
+    """A pooled AsyncClient with keep-alive, explicit timeouts and HTTP/2 when the h2 package is installed."""
+    max_connections = max_connections or int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+    if http2 is None:
+        http2 = HTTP2_AVAILABLE and os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+    return httpx.AsyncClient(
+        base_url=base_url,
+        http2=http2 and HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive or int(os.getenv("HTTP_MAX_KEEPALIVE", str(max_connections))),
+            keepalive_expiry=keepalive_expiry if keepalive_expiry is not None else float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+        ),
+        timeout=httpx.Timeout(
+            timeout if timeout is not None else float(os.getenv("HTTP_TIMEOUT", "60")),
+            connect=connect_timeout if connect_timeout is not None else float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+        )
+    )
+
+
+class AsyncTavilyClient:
+    """Async Tavily search over a shared, pooled HTTP client."""
+
+    def __init__(self, api_key: str = None, base_url: str = None, timeout: float = None):
+        self.api_key = api_key or os.getenv("TAVILY_API_KEY")
+        self.base_url = base_url or os.getenv("TAVILY_API_BASE", DEFAULT_TAVILY_BASE_URL)
+        self.timeout = timeout if timeout is not None else float(os.getenv("TAVILY_TIMEOUT", "30"))
+        self.stats = ConnectionStats()
+        self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = build_async_client(self.base_url, timeout=self.timeout)
+        return self._client
+
+    async def search(self, query: str, search_depth: str = "basic", include_domains: List[str] = None,
+                     max_results: int = None) -> Dict:
+        payload = {"api_key": self.api_key, "query": query, "search_depth": search_depth}
+        if include_domains:
+            payload["include_domains"] = include_domains
+        if max_results:
+            payload["max_results"] = max_results
+
+        started = time.perf_counter()
+        try:
+            response = await self._get_client().post(
+                "/search",
+                json=payload,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                extensions={"trace": self.stats.trace}
+            )
+            response.raise_for_status()
+        except httpx.HTTPError:
+            self.stats.record(time.perf_counter() - started, error=True)
+            raise
+        self.stats.record(time.perf_counter() - started)
+        return response.json()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class AsyncLLMClient:
+    """Async OpenAI-compatible chat completions, with one pooled HTTP client per base URL."""
+
+    def __init__(self, api_key: str = None, base_url: str = None):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = (base_url or os.getenv("OPENAI_API_BASE") or DEFAULT_OPENAI_BASE_URL).rstrip("/")
+        self.stats = ConnectionStats()
+        self._clients = {}
+
+    def _get_client(self, base_url: str, timeout: Optional[float]) -> httpx.AsyncClient:
+        key = (base_url, timeout)
+        if key not in self._clients:
+            self._clients[key] = build_async_client(base_url, timeout=timeout)
+        return self._clients[key]
+
+    async def chat(self, spec, messages: List[Dict], **params) -> Tuple[str, Dict]:
+        """Send a chat completion for a routed ModelSpec; returns (content, usage)."""
+        client = self._get_client((spec.base_url or self.base_url).rstrip("/"), spec.timeout)
+        started = time.perf_counter()
+        try:
+            response = await client.post(
+                "/chat/completions",
+                json=dict(params, model=spec.model, messages=messages),
+                headers={"Authorization": f"Bearer {spec.api_key or self.api_key}"},
+                extensions={"trace": self.stats.trace}
+            )
+            response.raise_for_status()
+        except httpx.HTTPError:
+            self.stats.record(time.perf_counter() - started, error=True)
+            raise
+        self.stats.record(time.perf_counter() - started)
+
+        data = response.json()
+        return data["choices"][0]["message"]["content"] or "", data.get("usage") or {}
+
+    async def aclose(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients = {}
@@ -0,0 +1,267 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from model_router import usage_tag
+from package_cache import package_key
+
+# Usage tag for the warmer's LLM calls, so its token budget ignores live traffic
+WARMER_USAGE_TAG = "warmer"
+
+# Level/style combinations warmed when there is no demand history to go on
+DEFAULT_COMBOS = [("Beginner", "Visual"), ("Intermediate", "Visual"), ("Beginner", "Reading")]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    topic_key TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    level TEXT NOT NULL,
+    style TEXT NOT NULL,
+    requested_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS requests_time ON requests (requested_at);
+"""
+
+
+class DemandLog:
+    """Log of live learning requests, used to find the most requested topics and level/style combinations.
+
+    Requests are written by a background thread, so logging never blocks or fails the request being logged.
+    """
+
+    def __init__(self, cache_dir: str = None, window_seconds: float = None, prune_interval: float = 3600,
+                 max_pending: int = 10000):
+        cache_dir = cache_dir or os.getenv("LEEMBO_CACHE_DIR", ".leembo_cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "demand.sqlite3")
+        self.window_seconds = window_seconds if window_seconds is not None else float(os.getenv("DEMAND_WINDOW", "604800"))
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def record(self, topic: str, level: str, style: str):
+        """Queue one request for logging. Never blocks; requests are dropped if the writer falls far behind."""
+        topic = str(topic)
+        entry = (" ".join(topic.lower().split()), topic, str(level or "Beginner"), str(style or "Visual"), time.time())
+        try:
+            self._pending.put_nowait(entry)
+        except queue.Full:
+            print("Error in DemandLog.record: write queue is full, dropping request")
+            return
+        self._ensure_writer()
+
+    def flush(self):
+        """Block until every queued request has been written (or failed to write)."""
+        self._pending.join()
+
+    def _ensure_writer(self):
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_pending, name="demand-log", daemon=True)
+                self._writer.start()
+
+    def _write_pending(self):
+        """Insert queued requests in batches; entries older than the demand window are pruned at most once per prune_interval."""
+        while True:
+            entries = [self._pending.get()]
+            while len(entries) < 500:
+                try:
+                    entries.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                conn = self._connect()
+                try:
+                    conn.executemany(
+                        "INSERT INTO requests (topic_key, topic, level, style, requested_at) VALUES (?, ?, ?, ?, ?)",
+                        entries
+                    )
+                finally:
+                    conn.close()
+                if time.monotonic() - self._last_prune >= self.prune_interval:
+                    self._last_prune = time.monotonic()
+                    self.prune()
+            except Exception as e:
+                print(f"Error in DemandLog writer: {str(e)}")
+            finally:
+                for _ in entries:
+                    self._pending.task_done()
+
+    def top_requests(self, limit: int) -> List[Tuple[str, str, str, int]]:
+        """Most requested (topic, level, style) combinations within the demand window."""
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT MIN(topic), level, style, COUNT(*) AS n FROM requests WHERE requested_at > ? "
+                "GROUP BY topic_key, level, style ORDER BY n DESC LIMIT ?",
+                (time.time() - self.window_seconds, limit)
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def top_combos(self, limit: int) -> List[Tuple[str, str]]:
+        """Most requested level/style combinations across all topics."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT level, style, COUNT(*) AS n FROM requests WHERE requested_at > ? "
+                "GROUP BY level, style ORDER BY n DESC LIMIT ?",
+                (time.time() - self.window_seconds, limit)
+            ).fetchall()
+            return [(level, style) for level, style, _ in rows]
+        finally:
+            conn.close()
+
+    def prune(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "DELETE FROM requests WHERE requested_at <= ?", (time.time() - self.window_seconds,)
+            ).rowcount
+        finally:
+            conn.close()
+
+
+class CacheWarmer:
+    """Pre-generates learning packages for trending and frequently requested topics.
+
+    Each run works through its plan one package at a time, pauses while `is_busy()` reports live
+    traffic, and stops once it exhausts its time or token budget.
+    """
+
+    def __init__(self, mentor, demand_log: DemandLog, is_busy: Callable[[], bool] = None,
+                 interval: float = None, time_budget: float = None, token_budget: int = None,
+                 max_packages: int = None, trending_limit: int = 5, combos_per_topic: int = 2):
+        self.mentor = mentor
+        self.demand_log = demand_log
+        self.is_busy = is_busy or (lambda: False)
+        self.interval = interval if interval is not None else float(os.getenv("CACHE_WARM_INTERVAL", "3600"))
+        self.time_budget = time_budget if time_budget is not None else float(os.getenv("CACHE_WARM_TIME_BUDGET", "600"))
+        self.token_budget = token_budget if token_budget is not None else int(os.getenv("CACHE_WARM_TOKEN_BUDGET", "200000"))
+        self.max_packages = max_packages if max_packages is not None else int(os.getenv("CACHE_WARM_MAX_PACKAGES", "20"))
+        self.trending_limit = trending_limit
+        self.combos_per_topic = combos_per_topic
+        self.busy_poll_interval = 1.0
+
+        self.last_report = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def plan(self) -> List[Tuple[str, str, str]]:
+        """Packages to warm, most valuable first: historical demand, then today's trending topics.
+
+        Trending topics are skipped when the lookup fell back to placeholder topics.
+        """
+        candidates = [(topic, level, style) for topic, level, style, _ in self.demand_log.top_requests(self.max_packages)]
+
+        combos = self.demand_log.top_combos(self.combos_per_topic) or DEFAULT_COMBOS[:self.combos_per_topic]
+        topics, is_fallback = self.mentor.trending_topics_result(limit=self.trending_limit)
+        if is_fallback:
+            print("Not warming trending topics: trending lookup fell back to placeholder topics")
+        else:
+            for topic in topics:
+                candidates.extend((topic, level, style) for level, style in combos)
+
+        plan = []
+        seen = set()
+        for topic, level, style in candidates:
+            key = package_key(topic, level, style)
+            if key in seen or self.mentor.package_cache.contains(topic, level, style):
+                continue
+            seen.add(key)
+            plan.append((topic, level, style))
+        return plan[:self.max_packages]
+
+    def _wait_until_idle(self, deadline: float) -> bool:
+        """Yield to live traffic; returns False if the deadline passed or the warmer was stopped."""
+        while self.is_busy():
+            if time.monotonic() >= deadline or self._stop.wait(self.busy_poll_interval):
+                return False
+        return time.monotonic() < deadline
+
+    def run_once(self) -> Dict:
+        """Warm as much of the current plan as the budgets allow and return a report."""
+        with usage_tag(WARMER_USAGE_TAG):
+            return self._run_once()
+
+    def _tokens_used(self) -> int:
+        return self.mentor.model_router.total_tokens(WARMER_USAGE_TAG)
+
+    def _run_once(self) -> Dict:
+        started = time.monotonic()
+        deadline = started + self.time_budget
+        tokens_at_start = self._tokens_used()
+        report = {"started_at": time.time(), "planned": 0, "warmed": 0, "failed": 0, "stopped_reason": "completed"}
+
+        try:
+            if not self._wait_until_idle(deadline):
+                report["stopped_reason"] = "busy"
+                return report
+            plan = self.plan()
+            report["planned"] = len(plan)
+
+            for topic, level, style in plan:
+                if self._tokens_used() - tokens_at_start >= self.token_budget:
+                    report["stopped_reason"] = "token_budget"
+                    break
+                if not self._wait_until_idle(deadline):
+                    report["stopped_reason"] = "stopped" if self._stop.is_set() else "time_budget"
+                    break
+                try:
+                    package = self.mentor.build_learning_package(topic, {"level": level, "style": style}, source="warmer")
+                    fallbacks = self.mentor.fallback_stages(topic, package)
+                    if fallbacks:
+                        print(f"Not warming {topic}: fallback {', '.join(fallbacks)}")
+                        report["failed"] += 1
+                    else:
+                        report["warmed"] += 1
+                except Exception as e:
+                    print(f"Error warming cache for {topic}: {str(e)}")
+                    report["failed"] += 1
+            return report
+        finally:
+            report["elapsed_seconds"] = round(time.monotonic() - started, 1)
+            report["tokens_used"] = self._tokens_used() - tokens_at_start
+            self.last_report = report
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Error in cache warmer: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def stats(self) -> Dict:
+        return {
+            "cache": self.mentor.package_cache.stats(),
+            "last_run": self.last_report
+        }
@@ -1,17 +1,23 @@
-import os
-from LeemboAI import EduMentorAI
+import argparse
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from LeemboAI import LeemboAI
+from cache_warmer import CacheWarmer, DemandLog
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
+from rich.progress import Progress, BarColumn, MofNCompleteColumn, TextColumn, TimeElapsedColumn
 
 console = Console()
 
 def display_welcome():
     welcome_text = """
     # 🎓 Welcome to Leembo.AI!
-    
+
     Your personalized learning assistant that helps you master any topic.
-    
+
     Type 'exit' at any time to quit.
     """
     console.print(Markdown(welcome_text))
@@ -19,19 +25,19 @@ def display_welcome():
 def display_results(results):
     # Display Assessment
     console.print(Panel(f"""
-    📊 Your Level: {results['assessment']['level']}
-    🎯 Learning Style: {results['assessment']['style']}
+    📊 Your Level: {results['assessment'].get('level', 'Beginner')}
+    🎯 Learning Style: {results['assessment'].get('style', 'Visual')}
     """, title="Assessment Results"))
 
     # Display Resources
     console.print("\n🔍 Curated Resources:")
     for resource in results['resources']:
-        console.print(f"- {resource['title']}")
-        console.print(f"  Summary: {resource['summary']}")
-        console.print(f"  Link: {resource['url']}\n")
+        console.print(f"- {resource.get('title', 'Untitled')}")
+        console.print(f"  Summary: {resource.get('summary', '')}")
+        console.print(f"  Link: {resource.get('url', '')}\n")
 
     # Display Explanation
-    console.print(Panel(results['explanation'], title="🧠 Explanation"))
+    console.print(Panel(Markdown(results['explanation']), title="🧠 Explanation"))
 
     # Display Quiz
     console.print("\n🧪 Quiz:")
@@ -40,32 +46,159 @@ def display_results(results):
         for j, option in enumerate(question['options'], 1):
             console.print(f"{j}. {option}")
 
-def main():
-    mentor = EduMentorAI()
+def resolve_assessment(mentor, topic, level=None, style=None, interactive=False):
+    """Use the given level/style, falling back to the assessor agent for whatever is missing."""
+    if level and style:
+        return {"level": level, "style": style}
+
+    assessment = dict(mentor.get_initial_assessment(topic)['assessment'])
+    if level:
+        assessment['level'] = level
+    if style:
+        assessment['style'] = style
+
+    if interactive:
+        console.print(f"\n📊 Suggested level: {assessment.get('level')}, learning style: {assessment.get('style')}")
+        new_level = console.input("Press Enter to accept, or type a level (Beginner/Intermediate/Advanced): ").strip()
+        if new_level:
+            assessment['level'] = new_level
+    return assessment
+
+def learn_topic(mentor, topic, level=None, style=None, interactive=False):
+    assessment = resolve_assessment(mentor, topic, level, style, interactive)
+    with console.status("[bold green]Preparing your learning package..."):
+        return mentor.build_learning_package(topic, assessment, source="cli")
+
+def run_learn(mentor, args):
+    if args.topic:
+        try:
+            display_results(learn_topic(mentor, args.topic, args.level, args.style))
+        except Exception as e:
+            console.print(f"[red]An error occurred: {str(e)}")
+            return 1
+        return 0
+
     display_welcome()
 
     while True:
         topic = console.input("\n📚 What would you like to learn about? ")
-        
+
         if topic.lower() == 'exit':
             console.print("\nThank you for learning with Leembo.AI! 👋")
             break
 
-        with console.status("[bold green]Processing your request..."):
-            try:
-                results = mentor.learn_topic(topic)
-                display_results(results)
-            except Exception as e:
-                console.print(f"[red]An error occurred: {str(e)}")
+        try:
+            results = learn_topic(mentor, topic, args.level, args.style, interactive=True)
+            display_results(results)
+        except Exception as e:
+            console.print(f"[red]An error occurred: {str(e)}")
 
         console.print("\nWould you like to:")
         console.print("1. Learn another topic")
         console.print("2. Exit")
-        
+
         choice = console.input("\nYour choice (1/2): ")
         if choice == "2":
             console.print("\nThank you for learning with Leembo.AI! 👋")
             break
+    return 0
+
+def read_topics(path):
+    """One topic per line; blank lines and lines starting with '#' are skipped."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+
+def run_batch(mentor, args):
+    topics = read_topics(args.topics_file)
+    if not topics:
+        console.print("[yellow]No topics found.")
+        return 0
+
+    write_lock = threading.Lock()
+    failures = 0
+
+    def generate(topic):
+        assessment = resolve_assessment(mentor, topic, args.level, args.style)
+        package = mentor.build_learning_package(topic, assessment, source="cli")
+        # Fallback output is not cached, so leave the topic out for a later run to retry
+        fallbacks = mentor.fallback_stages(topic, package)
+        if fallbacks:
+            raise RuntimeError(f"fell back for {', '.join(fallbacks)}")
+        return package
+
+    with open(args.output, "a", encoding="utf-8") as out, Progress(
+        TextColumn("[bold green]Generating packages"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+        console=console
+    ) as progress:
+        task = progress.add_task("batch", total=len(topics))
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+            futures = {executor.submit(generate, topic): topic for topic in topics}
+            for future in as_completed(futures):
+                topic = futures[future]
+                try:
+                    package = future.result()
+                    # Write each package as soon as it is ready so an interrupted run keeps its progress
+                    with write_lock:
+                        out.write(json.dumps(package) + "\n")
+                        out.flush()
+                except Exception as e:
+                    failures += 1
+                    progress.console.print(f"[red]Failed to generate '{topic}': {str(e)}")
+                progress.advance(task)
+
+    console.print(f"Wrote {len(topics) - failures} of {len(topics)} packages to {args.output}")
+    return 1 if failures else 0
+
+def run_warm(mentor, args):
+    warmer = CacheWarmer(
+        mentor,
+        DemandLog(mentor.package_cache.cache_dir),
+        time_budget=args.time_budget,
+        token_budget=args.token_budget,
+        max_packages=args.max_packages
+    )
+    with console.status("[bold green]Warming the package cache..."):
+        report = warmer.run_once()
+    console.print(Panel(json.dumps(report, indent=2), title="Cache warming report"))
+    return 1 if report["failed"] else 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Leembo.AI command-line interface")
+    parser.add_argument("--cache-dir", help="Directory for the on-disk package cache (shared with the API server)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    learn = subparsers.add_parser("learn", help="Learn a topic (interactive when no topic is given)")
+    learn.add_argument("topic", nargs="?", help="Topic to learn about")
+    learn.add_argument("--level", help="Skip the assessment and use this level")
+    learn.add_argument("--style", help="Skip the assessment and use this learning style")
+
+    batch = subparsers.add_parser("batch", help="Generate learning packages for every topic in a file")
+    batch.add_argument("topics_file", help="File with one topic per line")
+    batch.add_argument("-o", "--output", default="packages.jsonl", help="JSONL file to append packages to")
+    batch.add_argument("-c", "--concurrency", type=int, default=4, help="Topics generated in parallel")
+    batch.add_argument("--level", help="Use this level for every topic instead of assessing each one")
+    batch.add_argument("--style", help="Use this learning style for every topic instead of assessing each one")
+
+    warm = subparsers.add_parser("warm", help="Pre-generate packages for trending and frequently requested topics")
+    warm.add_argument("--time-budget", type=float, help="Stop after this many seconds")
+    warm.add_argument("--token-budget", type=int, help="Stop after this many LLM tokens")
+    warm.add_argument("--max-packages", type=int, help="Warm at most this many packages")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        args = build_parser().parse_args(["learn"] if args.cache_dir is None else ["--cache-dir", args.cache_dir, "learn"])
+
+    mentor = LeemboAI(cache_dir=args.cache_dir)
+    if args.command == "batch":
+        return run_batch(mentor, args)
+    if args.command == "warm":
+        return run_warm(mentor, args)
+    return run_learn(mentor, args)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
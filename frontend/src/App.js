@@ -244,6 +244,19 @@ function App() {
         userAge: userAge,
         userPreferences: userPreferences
       });
+
+      // A failed generation comes back as an apology with no materials; don't start a session for it
+      if (response.data.service_tier === 'error') {
+        toast({
+          title: 'Error',
+          description: response.data.explanation,
+          status: 'error',
+          duration: 5000,
+          isClosable: true,
+        });
+        setResults(null);
+        return;
+      }
       
       // Create new session
       const newSession = {
@@ -271,6 +284,16 @@ function App() {
         isClosable: true,
         position: 'top-right',
       });
+      if (['reduced', 'minimal'].includes(response.data.service_tier)) {
+        toast({
+          title: 'High demand',
+          description: 'We prepared a lighter learning package to keep things fast. Try again later for the full version.',
+          status: 'warning',
+          duration: 7000,
+          isClosable: true,
+          position: 'top-right',
+        });
+      }
     } catch (error) {
       toast({
         title: 'Error',
@@ -17,7 +17,7 @@ import {
   SlideFade
 } from '@chakra-ui/react';
 import { FaFire, FaSync, FaLightbulb, FaBrain, FaStar, FaChild, FaUserGraduate, FaUser } from 'react-icons/fa';
-import axios from 'axios';
+import { cachedGet } from '../utils/requestCache';
 
 export function HotTopicsSidebar({ suggestedQuestions, onQuestionSelect, userPreferences = [], userAge = '' }) {
   const [trendingTopics, setTrendingTopics] = useState([]);
@@ -69,18 +69,19 @@ export function HotTopicsSidebar({ suggestedQuestions, onQuestionSelect, userPre
   };
 
   // Function to fetch trending topics from our backend API
-  const fetchTrendingTopics = async () => {
+  // Repeated renders are served from the client cache; `force` revalidates with the server
+  const fetchTrendingTopics = async (force = false) => {
     setLoadingTopics(true);
     try {
       // Pass user age and preferences to the trending topics API
-      const response = await axios.post(`${API_URL}/api/trending_topics`, {
+      const data = await cachedGet(`${API_URL}/api/trending_topics`, {
         limit: 5,
         userAge: userAge,
         userPreferences: userPreferences
-      });
+      }, { force });
 
-      if (response.data && response.data.topics) {
-        setTrendingTopics(response.data.topics);
+      if (data && data.topics) {
+        setTrendingTopics(data.topics);
         setRefreshCount(prev => prev + 1);
       } else {
         throw new Error("Invalid response format");
@@ -194,7 +195,7 @@ export function HotTopicsSidebar({ suggestedQuestions, onQuestionSelect, userPre
               size="sm"
               aria-label="Refresh trending topics"
               isLoading={loadingTopics}
-              onClick={fetchTrendingTopics}
+              onClick={() => fetchTrendingTopics(true)}
               _hover={{ bg: accentBg }}
             />
           </Tooltip>
@@ -16,7 +16,7 @@ import {
   VStack
 } from '@chakra-ui/react';
 import { FaYoutube, FaExternalLinkAlt, FaGraduationCap, FaPlayCircle, FaStar, FaClock, FaSync, FaBook, FaLaptop, FaUser } from 'react-icons/fa';
-import axios from 'axios';
+import { cachedGet } from '../utils/requestCache';
 
 // Mock recommended courses - fallback data if API fails
 const FALLBACK_COURSES = [
@@ -144,7 +144,8 @@ export function RecommendedCourses({ userPreferences = [], currentTopic = "" })
       .slice(0, 4); // Return top 4 courses
   };
   
-  const fetchRecommendedCourses = async () => {
+  // Repeated renders are served from the client cache; `force` revalidates with the server
+  const fetchRecommendedCourses = async (force = false) => {
     setLoading(true);
     setError(null);
     
@@ -153,14 +154,14 @@ export function RecommendedCourses({ userPreferences = [], currentTopic = "" })
     
     try {
       // Call the backend API endpoint for recommended courses
-      const response = await axios.post(`${API_URL}/api/recommended_courses`, {
+      const data = await cachedGet(`${API_URL}/api/recommended_courses`, {
         userPreferences: userPreferences,
         currentTopic: currentTopic,
         limit: 4
-      });
+      }, { force });
       
-      if (response.data && response.data.courses) {
-        setCourses(response.data.courses);
+      if (data && data.courses) {
+        setCourses(data.courses);
       } else {
         throw new Error("Invalid response format from API");
       }
@@ -184,7 +185,7 @@ export function RecommendedCourses({ userPreferences = [], currentTopic = "" })
     return (
       <Box mt={6} textAlign="center">
         <Text color="red.500">{error}</Text>
-        <Button mt={2} onClick={fetchRecommendedCourses} size="sm">
+        <Button mt={2} onClick={() => fetchRecommendedCourses(true)} size="sm">
           Try Again
         </Button>
       </Box>
@@ -206,7 +207,7 @@ export function RecommendedCourses({ userPreferences = [], currentTopic = "" })
             variant="outline"
             colorScheme="green"
             isLoading={loading}
-            onClick={fetchRecommendedCourses}
+            onClick={() => fetchRecommendedCourses(true)}
           >
             Refresh
           </Button>
@@ -0,0 +1,76 @@
+import axios from 'axios';
+
+// Client-side cache for read-only GET endpoints.
+// Fresh responses are served from memory, concurrent identical requests share one
+// in-flight promise, and stale entries are revalidated with If-None-Match so an
+// unchanged response costs the backend a 304 and nothing else. A forced request
+// (Refresh buttons) also sends Cache-Control: no-cache so the server recomputes it.
+const responseCache = new Map();
+const inFlight = new Map();
+
+const DEFAULT_MAX_AGE_SECONDS = 300;
+
+// Build a stable URL: keys sorted, array values repeated (?a=1&a=2) and sorted
+export const buildCacheKey = (url, params = {}) => {
+  const search = new URLSearchParams();
+  Object.keys(params).sort().forEach(key => {
+    const value = params[key];
+    if (value === undefined || value === null || value === '') return;
+    if (Array.isArray(value)) {
+      [...value].map(String).sort().forEach(item => search.append(key, item));
+    } else {
+      search.append(key, String(value));
+    }
+  });
+  const query = search.toString();
+  return query ? `${url}?${query}` : url;
+};
+
+const parseMaxAge = (cacheControl) => {
+  if (/no-cache|no-store/.test(cacheControl || '')) return 0;
+  const match = /max-age=(\d+)/.exec(cacheControl || '');
+  return match ? parseInt(match[1], 10) : DEFAULT_MAX_AGE_SECONDS;
+};
+
+export const cachedGet = (url, params = {}, { force = false } = {}) => {
+  const key = buildCacheKey(url, params);
+  const cached = responseCache.get(key);
+
+  if (!force && cached && cached.expiresAt > Date.now()) {
+    return Promise.resolve(cached.data);
+  }
+
+  if (!force && inFlight.has(key)) {
+    return inFlight.get(key);
+  }
+
+  const headers = cached && cached.etag ? { 'If-None-Match': cached.etag } : {};
+  if (force) {
+    headers['Cache-Control'] = 'no-cache';
+  }
+  const request = axios.get(key, {
+    headers,
+    validateStatus: status => (status >= 200 && status < 300) || status === 304
+  })
+    .then(response => {
+      const maxAge = parseMaxAge(response.headers['cache-control']);
+      if (response.status === 304 && cached) {
+        cached.expiresAt = Date.now() + maxAge * 1000;
+        return cached.data;
+      }
+      responseCache.set(key, {
+        data: response.data,
+        etag: response.headers['etag'],
+        expiresAt: Date.now() + maxAge * 1000
+      });
+      return response.data;
+    })
+    .finally(() => {
+      if (inFlight.get(key) === request) {
+        inFlight.delete(key);
+      }
+    });
+
+  inFlight.set(key, request);
+  return request;
+};
@@ -0,0 +1,343 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TERMINAL_STATUSES = (SUCCEEDED, FAILED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    idempotency_key TEXT UNIQUE,
+    topic TEXT NOT NULL,
+    assessment TEXT NOT NULL,
+    status TEXT NOT NULL,
+    checkpoints TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires_at REAL,
+    request_hash TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+
+class IdempotencyConflict(Exception):
+    """Raised when an idempotency key is reused with a different request body."""
+
+
+def request_hash(topic: str, assessment: Dict) -> str:
+    return hashlib.sha256(json.dumps([topic, assessment], sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """SQLite-backed durable queue of learning-package generation jobs.
+
+    Each finished stage (resources, explanation, quiz) is checkpointed on the job row, so a job
+    picked up again after a crash or an expired lease only runs the stages that are still missing.
+    """
+
+    def __init__(self, path: str = None, max_attempts: int = 3):
+        self.path = path or os.getenv("LEEMBO_JOBS_DB", "leembo_jobs.sqlite3")
+        self.max_attempts = max_attempts
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            # Databases created before request hashes were stored
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "request_hash" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN request_hash TEXT")
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict:
+        return {
+            "id": row["id"],
+            "idempotency_key": row["idempotency_key"],
+            "topic": row["topic"],
+            "assessment": json.loads(row["assessment"]),
+            "status": row["status"],
+            "checkpoints": json.loads(row["checkpoints"]),
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "attempts": row["attempts"],
+            "worker_id": row["worker_id"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def submit(self, topic: str, assessment: Dict, idempotency_key: str = None) -> Tuple[Dict, bool]:
+        """Queue a job, or return the existing one for this idempotency key.
+
+        Returns (job, created). Resubmitting a failed job requeues it with its checkpoints intact.
+        Raises IdempotencyConflict if the key was first used with a different topic or assessment.
+        """
+        now = time.time()
+        body_hash = request_hash(topic, assessment)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if idempotency_key:
+                row = conn.execute("SELECT * FROM jobs WHERE idempotency_key = ?", (idempotency_key,)).fetchone()
+                if row is not None:
+                    if row["request_hash"] is not None and row["request_hash"] != body_hash:
+                        raise IdempotencyConflict(
+                            f"Idempotency-Key {idempotency_key} was already used for a different request"
+                        )
+                    if row["status"] == FAILED:
+                        conn.execute(
+                            "UPDATE jobs SET status = ?, error = NULL, attempts = 0, updated_at = ? WHERE id = ?",
+                            (QUEUED, now, row["id"])
+                        )
+                        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                    conn.execute("COMMIT")
+                    return self._to_dict(row), False
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, idempotency_key, topic, assessment, status, request_hash, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, idempotency_key, topic, json.dumps(assessment), QUEUED, body_hash, now, now)
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            conn.execute("COMMIT")
+            return self._to_dict(row), True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._to_dict(row) if row is not None else None
+        finally:
+            conn.close()
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict]:
+        """Atomically take the oldest queued job, or a running job whose worker's lease expired.
+
+        Expired jobs that have already used all their attempts are failed instead of reclaimed,
+        so a job that keeps crashing its worker cannot block the queue.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = COALESCE(error, ?), lease_expires_at = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                (FAILED, "Lease expired on the final attempt", now, RUNNING, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE (status = ? OR (status = ? AND lease_expires_at < ?)) AND attempts < ? "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, RUNNING, now, self.max_attempts)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, lease_expires_at = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?",
+                (RUNNING, worker_id, now + lease_seconds, now, row["id"])
+            )
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+            conn.execute("COMMIT")
+            return self._to_dict(job)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float):
+        """Extend the lease on a job this worker is still processing."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+                (time.time() + lease_seconds, job_id, worker_id, RUNNING)
+            )
+        finally:
+            conn.close()
+
+    def checkpoint(self, job_id: str, worker_id: str, stage: str, value) -> bool:
+        """Persist one finished stage of a job; ignored unless worker_id still holds the job."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT checkpoints FROM jobs WHERE id = ? AND worker_id = ? AND status = ?",
+                (job_id, worker_id, RUNNING)
+            ).fetchone()
+            if row is not None:
+                checkpoints = json.loads(row["checkpoints"])
+                checkpoints[stage] = value
+                conn.execute(
+                    "UPDATE jobs SET checkpoints = ?, updated_at = ? WHERE id = ?",
+                    (json.dumps(checkpoints), time.time(), job_id)
+                )
+            conn.execute("COMMIT")
+            return row is not None
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def complete(self, job_id: str, worker_id: str, result: Dict) -> bool:
+        """Store a job's result; returns False if worker_id no longer holds the job."""
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (SUCCEEDED, json.dumps(result), time.time(), job_id, worker_id, RUNNING)
+            ).rowcount > 0
+        finally:
+            conn.close()
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Record a failed attempt; the job is requeued until it runs out of attempts.
+
+        Returns False if worker_id no longer holds the job, in which case nothing changes.
+        """
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, error = ?, "
+                "lease_expires_at = NULL, updated_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+                (self.max_attempts, FAILED, QUEUED, error, time.time(), job_id, worker_id, RUNNING)
+            ).rowcount > 0
+        finally:
+            conn.close()
+
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for or being processed by a worker."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)).fetchone()
+            return row[0]
+        finally:
+            conn.close()
+
+
+class JobWorkerPool:
+    """Background worker threads that consume jobs from a JobStore using a LeemboAI engine."""
+
+    def __init__(self, store: JobStore, mentor, workers: int = 2, lease_seconds: float = 120,
+                 poll_interval: float = 0.5):
+        self.store = store
+        self.mentor = mentor
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+        self._active = {}
+        self._active_lock = threading.Lock()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        prefix = uuid.uuid4().hex[:8]
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, args=(f"{prefix}-{i}",), name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._active_lock:
+                active = list(self._active.items())
+            for job_id, worker_id in active:
+                try:
+                    self.store.heartbeat(job_id, worker_id, self.lease_seconds)
+                except Exception as e:
+                    print(f"Error extending lease for job {job_id}: {str(e)}")
+
+    def _work(self, worker_id: str):
+        while not self._stop.is_set():
+            try:
+                job = self.store.claim(worker_id, self.lease_seconds)
+            except Exception as e:
+                print(f"Error claiming job: {str(e)}")
+                job = None
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+
+            with self._active_lock:
+                self._active[job["id"]] = worker_id
+            try:
+                self.process(job)
+            finally:
+                with self._active_lock:
+                    self._active.pop(job["id"], None)
+
+    def process(self, job: Dict):
+        """Run the missing stages of a job, checkpointing each one as it finishes.
+
+        Results are dropped if the job was reclaimed by another worker after this one's lease lapsed.
+        """
+        worker_id = job["worker_id"]
+        assessment = job["assessment"]
+        level = str(assessment.get("level") or "Beginner")
+        style = str(assessment.get("style") or "Visual")
+        try:
+            package = self.mentor.package_cache.get(job["topic"], level, style)
+            generated = package is None
+            if generated:
+                stages = self.mentor.run_learning_stages(
+                    job["topic"], level, style,
+                    completed=job["checkpoints"],
+                    on_stage=lambda stage, value: self.store.checkpoint(job["id"], worker_id, stage, value)
+                )
+                package = {
+                    "topic": job["topic"],
+                    "assessment": assessment,
+                    "resources": stages["resources"],
+                    "explanation": stages["explanation"],
+                    "quiz": stages["quiz"]
+                }
+            if not self.store.complete(job["id"], worker_id, dict(package, topic=job["topic"], assessment=assessment)):
+                print(f"Dropping result of job {job['id']}: lease was lost to another worker")
+                return
+            # Packages with fallback stages are returned to this job but not cached for everyone else
+            if generated and not self.mentor.fallback_stages(job["topic"], package):
+                self.mentor.package_cache.set(job["topic"], level, style, package, source="job")
+        except Exception as e:
+            print(f"Error in job {job['id']}: {str(e)}")
+            if not self.store.fail(job["id"], worker_id, str(e)):
+                print(f"Dropping failure of job {job['id']}: lease was lost to another worker")
@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict
+
+# Degradation tiers, from full service to most degraded
+FULL = "full"              # resources + explanation + quiz
+REDUCED = "reduced"        # skip resource curation
+MINIMAL = "minimal"        # skip resources, short explanation, fallback quiz
+CACHE_ONLY = "cache_only"  # serve cached packages only; misses are rejected
+TIERS = [FULL, REDUCED, MINIMAL, CACHE_ONLY]
+
+# service_tier of a package whose generation failed; it carries only an apology, no content
+ERROR = "error"
+
+
+class OverloadedError(Exception):
+    """Raised when a request cannot be served from cache while the server is shedding load."""
+
+    def __init__(self, retry_after: int = None):
+        super().__init__("Server is overloaded; only cached learning packages are being served")
+        self.retry_after = retry_after if retry_after is not None else int(os.getenv("LOAD_RETRY_AFTER", "30"))
+
+
+def _thresholds(name: str, defaults: str):
+    # "reduced,minimal,cache_only" thresholds, e.g. LOAD_DEPTH_THRESHOLDS=4,8,16
+    return [float(value) for value in os.getenv(name, defaults).split(",")]
+
+
+class LoadMonitor:
+    """Tracks in-flight generations, job queue depth and recent latency, and maps them to a service tier.
+
+    The tier is the most degraded one triggered by either signal: depth (in-flight live generations plus
+    queued jobs) or the p95 latency of generations completed within the latency window.
+    The job queue depth is refreshed on a background thread at most every `depth_ttl` seconds, so
+    picking a tier never blocks the event loop on the job store.
+    """
+
+    def __init__(self, queue_depth: Callable[[], int] = None, depth_thresholds=None, latency_thresholds=None,
+                 latency_window: float = 120, min_samples: int = 5, depth_ttl: float = 1.0):
+        self.queue_depth = queue_depth or (lambda: 0)
+        self.depth_ttl = depth_ttl
+        self.depth_thresholds = depth_thresholds or _thresholds("LOAD_DEPTH_THRESHOLDS", "4,8,16")
+        self.latency_thresholds = latency_thresholds or _thresholds("LOAD_P95_THRESHOLDS", "60,90,120")
+        self.latency_window = latency_window
+        self.min_samples = min_samples
+        self.in_flight = 0
+        self.served = {tier: 0 for tier in (FULL, REDUCED, MINIMAL, ERROR)}
+        self.cached_served = 0
+        self.rejected = 0
+        self._latencies = deque()
+        self._queued = 0
+        self._queued_at = float("-inf")
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def begin(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self, latency: float = None):
+        """Mark a generation finished; pass its latency to include it in the p95."""
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+            if latency is not None:
+                self._latencies.append((now, latency))
+            while self._latencies and self._latencies[0][0] < now - self.latency_window:
+                self._latencies.popleft()
+
+    def p95_latency(self) -> float:
+        cutoff = time.monotonic() - self.latency_window
+        with self._lock:
+            recent = sorted(latency for finished, latency in self._latencies if finished >= cutoff)
+        if len(recent) < self.min_samples:
+            return 0.0
+        return recent[min(len(recent) - 1, int(0.95 * len(recent)))]
+
+    def refresh_queue_depth(self):
+        """Read the job queue depth now; on error the previous value is kept."""
+        try:
+            queued = self.queue_depth()
+        except Exception as e:
+            print(f"Error reading queue depth: {str(e)}")
+            queued = None
+        with self._lock:
+            if queued is not None:
+                self._queued = queued
+            self._queued_at = time.monotonic()
+            self._refreshing = False
+
+    def depth(self) -> int:
+        with self._lock:
+            stale = not self._refreshing and time.monotonic() - self._queued_at >= self.depth_ttl
+            if stale:
+                self._refreshing = True
+            depth = self.in_flight + self._queued
+        if stale:
+            threading.Thread(target=self.refresh_queue_depth, name="load-queue-depth", daemon=True).start()
+        return depth
+
+    def is_busy(self) -> bool:
+        return self.depth() > 0
+
+    def _level(self, value: float, thresholds) -> int:
+        return sum(1 for threshold in thresholds if value >= threshold)
+
+    def tier(self) -> str:
+        """Tier to serve the next request at."""
+        level = max(
+            self._level(self.depth(), self.depth_thresholds),
+            self._level(self.p95_latency(), self.latency_thresholds)
+        )
+        return TIERS[min(level, len(TIERS) - 1)]
+
+    def record_served(self, service_tier: str, cached: bool = False):
+        """Count a learning package by the tier it was actually served at."""
+        with self._lock:
+            self.served[service_tier] = self.served.get(service_tier, 0) + 1
+            if cached:
+                self.cached_served += 1
+
+    def record_rejected(self):
+        """Count a request shed with 503 because nothing was cached for it."""
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> Dict:
+        return {
+            "tier": self.tier(),
+            "in_flight": self.in_flight,
+            "depth": self.depth(),
+            "p95_latency": round(self.p95_latency(), 3),
+            "depth_thresholds": self.depth_thresholds,
+            "latency_thresholds": self.latency_thresholds,
+            "served": dict(self.served),
+            "cached_served": self.cached_served,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,247 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+# Model names are read when routes are built rather than at import, so values loaded from .env
+# after this module is imported still apply
+def default_model() -> str:
+    return os.getenv("OPENAI_MODEL_NAME", "gpt-4o")
+
+
+def fast_model() -> str:
+    return os.getenv("FAST_MODEL_NAME", "gpt-4o-mini")
+
+
+def default_routes() -> Dict[str, Dict]:
+    """Default per-role routes.
+
+    Structured, short-output roles go to the fast model; long-form explanations get the
+    default model and fall back to the fast one when they breach their latency SLO.
+    """
+    fast = fast_model()
+    return {
+        "level_assessor": {"model": fast, "slo_seconds": 10},
+        "trend_analyzer": {"model": fast, "slo_seconds": 20},
+        "curator": {"model": fast, "slo_seconds": 20},
+        "explainer": {"model": default_model(), "fallback_model": fast, "slo_seconds": 45},
+        "quiz_generator": {"model": fast, "slo_seconds": 25},
+    }
+
+
+# Tag that LLM usage recorded in the current context is attributed to, e.g. "warmer" for cache warming
+_usage_tag = contextvars.ContextVar("model_usage_tag", default=None)
+
+
+@contextmanager
+def usage_tag(tag: str):
+    """Attribute token usage recorded inside this block (and in contexts copied from it) to `tag`."""
+    token = _usage_tag.set(tag)
+    try:
+        yield
+    finally:
+        _usage_tag.reset(token)
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """An LLM endpoint a role can be routed to."""
+    model: str
+    base_url: Optional[str] = None
+    api_key: Optional[str] = None
+    timeout: Optional[float] = None
+
+
+@dataclass
+class RoleRoute:
+    """Routing policy for one agent role."""
+    role: str
+    primary: ModelSpec
+    fallback: Optional[ModelSpec] = None
+    slo_seconds: float = 30.0
+    window: int = 10
+    cooldown_seconds: float = 120.0
+    error_threshold: int = 2
+    degraded_until: float = 0.0
+    consecutive_errors: int = 0
+    recent: deque = field(default_factory=deque)
+
+
+class ModelMetrics:
+    """Latency and token counters for one (role, model) pair."""
+
+    def __init__(self, window: int = 200):
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self.latencies = deque(maxlen=window)
+
+    def snapshot(self) -> Dict:
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "avg_tokens_per_call": round(self.total_tokens / self.calls, 1) if self.calls else 0.0,
+            "latency_p50": _quantile(latencies, 0.5),
+            "latency_p95": _quantile(latencies, 0.95),
+            "latency_max": round(latencies[-1], 3) if latencies else 0.0,
+        }
+
+
+def _quantile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 3)
+
+
+def _usage_value(usage, key: str) -> int:
+    if usage is None:
+        return 0
+    value = usage.get(key, 0) if isinstance(usage, dict) else getattr(usage, key, 0)
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _spec_from_config(config: Dict, prefix: str = "") -> Optional[ModelSpec]:
+    model = config.get(f"{prefix}model")
+    if not model:
+        return None
+    timeout = config.get(f"{prefix}timeout")
+    return ModelSpec(
+        model=model,
+        base_url=config.get(f"{prefix}base_url"),
+        api_key=config.get(f"{prefix}api_key"),
+        timeout=float(timeout) if timeout is not None else None
+    )
+
+
+class ModelRouter:
+    """Chooses an LLM per agent role and falls back to a faster model while a role's latency SLO is violated.
+
+    Routes come from default_routes(), overridden per role by the JSON file named in MODEL_ROUTES_FILE, e.g.
+    {"explainer": {"model": "gpt-4o", "base_url": "http://127.0.0.1:9000/v1",
+                   "fallback_model": "gpt-4o-mini", "slo_seconds": 30}}
+    """
+
+    def __init__(self, routes: Dict[str, Dict] = None):
+        if routes is None:
+            routes = self.load_routes()
+        self.routes = {}
+        for role, config in routes.items():
+            self.routes[role] = RoleRoute(
+                role=role,
+                primary=_spec_from_config(config) or ModelSpec(model=default_model()),
+                fallback=_spec_from_config(config, "fallback_"),
+                slo_seconds=float(config.get("slo_seconds", 30.0)),
+                window=int(config.get("window", 10)),
+                cooldown_seconds=float(config.get("cooldown_seconds", 120.0)),
+                error_threshold=int(config.get("error_threshold", 2))
+            )
+        self._metrics = {}
+        self._tagged_tokens = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def load_routes() -> Dict[str, Dict]:
+        """Merge the routes file named by MODEL_ROUTES_FILE over the defaults."""
+        routes = default_routes()
+        routes_file = os.getenv("MODEL_ROUTES_FILE")
+        if routes_file:
+            try:
+                with open(routes_file) as f:
+                    overrides = json.load(f)
+                for role, config in overrides.items():
+                    routes.setdefault(role, {}).update(config)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error loading model routes from {routes_file}: {str(e)}")
+        return routes
+
+    def route(self, role: str) -> RoleRoute:
+        if role not in self.routes:
+            self.routes[role] = RoleRoute(role=role, primary=ModelSpec(model=default_model()))
+        return self.routes[role]
+
+    def select(self, role: str) -> ModelSpec:
+        """Return the model the next call for this role should use."""
+        route = self.route(role)
+        if route.fallback is not None and time.monotonic() < route.degraded_until:
+            return route.fallback
+        return route.primary
+
+    def is_degraded(self, role: str) -> bool:
+        route = self.route(role)
+        return route.fallback is not None and time.monotonic() < route.degraded_until
+
+    def record(self, role: str, spec: ModelSpec, latency: float, usage=None, error: bool = False):
+        """Record one call and re-evaluate the role's SLO."""
+        route = self.route(role)
+        with self._lock:
+            metrics = self._metrics.setdefault((role, spec.model, spec.base_url), ModelMetrics())
+            metrics.calls += 1
+            metrics.latencies.append(latency)
+            if error:
+                metrics.errors += 1
+            metrics.prompt_tokens += _usage_value(usage, "prompt_tokens")
+            metrics.completion_tokens += _usage_value(usage, "completion_tokens")
+            metrics.total_tokens += _usage_value(usage, "total_tokens")
+            tag = _usage_tag.get()
+            if tag is not None:
+                self._tagged_tokens[tag] = self._tagged_tokens.get(tag, 0) + _usage_value(usage, "total_tokens")
+
+            if spec != route.primary or route.fallback is None:
+                return
+
+            # Errors count as SLO violations so a failing primary is also routed around, but a single
+            # transient error only trips the route once `error_threshold` errors happen in a row
+            route.recent.append(float("inf") if error else latency)
+            while len(route.recent) > route.window:
+                route.recent.popleft()
+            route.consecutive_errors = route.consecutive_errors + 1 if error else 0
+
+            violations = sum(1 for value in route.recent if value > route.slo_seconds)
+            if route.consecutive_errors >= route.error_threshold or (
+                len(route.recent) >= 3 and violations * 2 > len(route.recent)
+            ):
+                route.degraded_until = time.monotonic() + route.cooldown_seconds
+                route.recent.clear()
+                route.consecutive_errors = 0
+                print(f"Model route for {role} degraded to {route.fallback.model} "
+                      f"for {route.cooldown_seconds:.0f}s (SLO {route.slo_seconds}s)")
+
+    def total_tokens(self, tag: str = None) -> int:
+        """Tokens used across all roles and models since startup, or only those recorded under a usage tag."""
+        with self._lock:
+            if tag is not None:
+                return self._tagged_tokens.get(tag, 0)
+            return sum(metrics.total_tokens for metrics in self._metrics.values())
+
+    def metrics(self) -> Dict:
+        """Per-role routing state and per-model latency/token metrics."""
+        with self._lock:
+            snapshot = {}
+            for role, route in self.routes.items():
+                snapshot[role] = {
+                    "primary_model": route.primary.model,
+                    "fallback_model": route.fallback.model if route.fallback else None,
+                    "slo_seconds": route.slo_seconds,
+                    "degraded": route.fallback is not None and time.monotonic() < route.degraded_until,
+                    "models": {}
+                }
+            for (role, model, base_url), metrics in self._metrics.items():
+                key = model if base_url is None else f"{model}@{base_url}"
+                snapshot.setdefault(role, {"models": {}})["models"][key] = metrics.snapshot()
+            return snapshot
@@ -0,0 +1,147 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages (
+    key TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    level TEXT NOT NULL,
+    style TEXT NOT NULL,
+    package TEXT NOT NULL,
+    source TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS packages_expires ON packages (expires_at);
+"""
+
+
+def package_key(topic: str, level: str, style: str) -> str:
+    """Cache key for a learning package; topic whitespace and case are normalized."""
+    return json.dumps([" ".join(topic.lower().split()), level.lower(), style.lower()])
+
+
+class PackageCache:
+    """On-disk cache of complete learning packages, shared by the API server and the CLI.
+
+    Packages are keyed by (topic, level, style) and stored in a SQLite file inside the cache
+    directory, so any process pointed at the same directory reuses what the others generated.
+    """
+
+    def __init__(self, cache_dir: str = None, ttl: float = None, purge_interval: float = 3600):
+        self.cache_dir = cache_dir or os.getenv("LEEMBO_CACHE_DIR", ".leembo_cache")
+        self.ttl = ttl if ttl is not None else float(os.getenv("PACKAGE_CACHE_TTL", "86400"))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, "packages.sqlite3")
+        self.hits = 0
+        self.misses = 0
+        self.warm_hits = 0
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get(self, topic: str, level: str, style: str) -> Optional[Dict]:
+        """Return the cached package, or None if it is missing or expired."""
+        key = package_key(topic, level, style)
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT package, source FROM packages WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE packages SET hits = hits + 1 WHERE key = ?", (key,))
+        finally:
+            conn.close()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if row["source"] == "warmer":
+                self.warm_hits += 1
+        return json.loads(row["package"])
+
+    def contains(self, topic: str, level: str, style: str) -> bool:
+        """Whether a fresh package exists, without counting as a lookup."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM packages WHERE key = ? AND expires_at > ?",
+                (package_key(topic, level, style), time.time())
+            ).fetchone()
+            return row is not None
+        finally:
+            conn.close()
+
+    def set(self, topic: str, level: str, style: str, package: Dict, source: str = "api"):
+        """Store a package; `source` records which process produced it.
+
+        Expired packages are purged at most once per purge_interval.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO packages (key, topic, level, style, package, source, hits, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)",
+                (package_key(topic, level, style), topic, level, style, json.dumps(package), source, now, now + self.ttl)
+            )
+        finally:
+            conn.close()
+
+        with self._lock:
+            purge = time.monotonic() - self._last_purge >= self.purge_interval
+            if purge:
+                self._last_purge = time.monotonic()
+        if purge:
+            self.purge_expired()
+
+    def stats(self) -> Dict:
+        """Lookup counters for this process plus how many warmed packages have been used."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) AS warmed, SUM(CASE WHEN hits > 0 THEN 1 ELSE 0 END) AS used "
+                "FROM packages WHERE source = 'warmer' AND expires_at > ?",
+                (time.time(),)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "lookups": lookups,
+                "hits": self.hits,
+                "warm_hits": self.warm_hits,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "warm_hit_ratio": round(self.warm_hits / lookups, 3) if lookups else 0.0,
+                "warmed_packages": row["warmed"] or 0,
+                "warmed_packages_used": row["used"] or 0
+            }
+
+    def purge_expired(self) -> int:
+        """Delete expired packages; returns how many were removed."""
+        conn = self._connect()
+        try:
+            return conn.execute("DELETE FROM packages WHERE expires_at <= ?", (time.time(),)).rowcount
+        finally:
+            conn.close()
@@ -0,0 +1,202 @@
+import re
+import zlib
+from typing import List, Dict, Sequence, Tuple
+
+import numpy as np
+
+from ttl_cache import TTLCache
+
+# Hashed feature space; large enough that collisions between short titles are rare
+N_FEATURES = 2 ** 18
+
+# Cosine similarity above which a candidate counts as matching the user's interests
+MATCH_THRESHOLD = 0.2
+
+# Pools up to this size are scored against a dense (candidates x pool features) matrix instead of
+# an inverted index over the whole hashed feature space
+DENSE_POOL_SIZE = 256
+
+# Share of the final ranking score that comes from interest similarity rather than LLM relevance
+INTEREST_WEIGHT = 0.4
+
+STOPWORDS = {
+    "a", "an", "and", "the", "of", "in", "on", "for", "to", "with", "by", "at", "from",
+    "is", "are", "how", "what", "why", "your", "you", "its", "it", "as", "into", "about",
+    "latest", "recent", "developments", "advances", "introduction", "intro", "basics",
+    "course", "courses", "complete", "beginners", "beginner", "guide", "explained",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+# A sparse vector: (feature indices, weights), indices unique
+SparseVector = Tuple[np.ndarray, np.ndarray]
+
+
+def _tokens(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        # Cheap plural folding so "networks" and "network" share a feature
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _feature(term: str) -> int:
+    # crc32 is stable across processes, unlike hash()
+    return zlib.crc32(term.encode("utf-8")) % N_FEATURES
+
+
+def vectorize(texts: Sequence[str]) -> SparseVector:
+    """Hash one or more texts into a single L2-normalized sparse vector of unigrams and bigrams."""
+    features = {}
+    for text in texts:
+        tokens = _tokens(text or "")
+        terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for term in terms:
+            index = _feature(term)
+            features[index] = features.get(index, 0.0) + 1.0
+
+    if not features:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    indices = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+    weights = np.sqrt(np.fromiter(features.values(), dtype=np.float32, count=len(features)))
+    return indices, weights / np.linalg.norm(weights)
+
+
+class CandidateIndex:
+    """Precomputed sparse vectors for a candidate pool, stored for fast scoring.
+
+    Small pools keep a dense matrix over just the features they use; large pools use an inverted index.
+    """
+
+    def __init__(self, items: List, texts: List[str]):
+        self.items = items
+        self.size = len(items)
+
+        rows, cols, vals = [], [], []
+        for row, text in enumerate(texts):
+            indices, weights = vectorize([text])
+            rows.append(np.full(len(indices), row, dtype=np.int64))
+            cols.append(indices)
+            vals.append(weights)
+
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        vals = np.concatenate(vals) if vals else np.empty(0, dtype=np.float32)
+
+        self._dense = None
+        if self.size <= DENSE_POOL_SIZE:
+            self._features, local = np.unique(cols, return_inverse=True)
+            self._dense = np.zeros((self.size, len(self._features)), dtype=np.float32)
+            self._dense[rows, local] = vals
+            return
+
+        # Column-major (feature -> postings) layout: postings of feature f live in [indptr[f], indptr[f + 1])
+        order = np.argsort(cols, kind="stable")
+        self._rows = rows[order]
+        self._vals = vals[order]
+        self._indptr = np.zeros(N_FEATURES + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=N_FEATURES), out=self._indptr[1:])
+
+    @classmethod
+    def from_courses(cls, courses: List[Dict]) -> "CandidateIndex":
+        texts = [" ".join([course.get("title", "")] + list(course.get("tags", []))) for course in courses]
+        return cls(courses, texts)
+
+    def score(self, query: SparseVector) -> np.ndarray:
+        """Cosine similarity of every candidate against a sparse query vector."""
+        indices, weights = query
+        if self.size == 0 or len(indices) == 0:
+            return np.zeros(self.size, dtype=np.float32)
+
+        if self._dense is not None:
+            if len(self._features) == 0:
+                return np.zeros(self.size, dtype=np.float32)
+            # Map query features onto the pool's dense columns, dropping those the pool never uses
+            positions = np.minimum(np.searchsorted(self._features, indices), len(self._features) - 1)
+            present = self._features[positions] == indices
+            return (self._dense[:, positions[present]] @ weights[present]).astype(np.float32)
+
+        starts = self._indptr[indices]
+        counts = self._indptr[indices + 1] - starts
+        if counts.sum() == 0:
+            return np.zeros(self.size, dtype=np.float32)
+
+        # Gather the postings of every query feature in one shot
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        contributions = self._vals[positions] * np.repeat(weights, counts)
+        return np.bincount(self._rows[positions], weights=contributions, minlength=self.size).astype(np.float32)
+
+    def score_many(self, queries: Sequence[SparseVector]) -> np.ndarray:
+        """Score a batch of queries, returning a (len(queries), size) matrix."""
+        if not queries:
+            return np.zeros((0, self.size), dtype=np.float32)
+        return np.vstack([self.score(query) for query in queries])
+
+
+def top_k(scores: np.ndarray, k: int, tiebreak: np.ndarray = None) -> np.ndarray:
+    """Indices of the k highest scores, best first; ties are broken by tiebreak (higher first), then by position."""
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    if tiebreak is None:
+        candidates = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+        return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+    # With a tiebreak, keep every candidate that ties with the k-th score before the final sort
+    threshold = np.partition(scores, n - k)[n - k]
+    candidates = np.flatnonzero(scores >= threshold)
+    order = np.lexsort((candidates, -tiebreak[candidates], -scores[candidates]))
+    return candidates[order][:k]
+
+
+class InterestRanker:
+    """Ranks candidates against users' interest vectors, which are cached per preference set."""
+
+    def __init__(self, cache_ttl: float = 3600):
+        self._user_vectors = TTLCache(ttl=cache_ttl, max_entries=50000)
+
+    def user_vector(self, preferences: Sequence[str]) -> SparseVector:
+        """Interest vector for a list of preferences, each preference weighted equally."""
+        key = tuple(sorted({pref.strip().lower() for pref in preferences or [] if pref and pref.strip()}))
+        vector = self._user_vectors.get(key)
+        if vector is None:
+            features = {}
+            for pref in key:
+                indices, weights = vectorize([pref])
+                for index, weight in zip(indices.tolist(), weights.tolist()):
+                    features[index] = features.get(index, 0.0) + weight
+            if features:
+                indices = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+                weights = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+                vector = (indices, weights / np.linalg.norm(weights))
+            else:
+                vector = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+            self._user_vectors.set(key, vector)
+        return vector
+
+    def score(self, index: CandidateIndex, preferences: Sequence[str] = None,
+              query: str = "", query_weight: float = 2.0) -> np.ndarray:
+        """Combined relevance: similarity to the user's interests plus weighted similarity to an explicit query."""
+        scores = index.score(self.user_vector(preferences or []))
+        if query:
+            scores = scores + query_weight * index.score(vectorize([query]))
+        return scores
+
+    def match_scores(self, index: CandidateIndex, preferences: Sequence[str]) -> np.ndarray:
+        """Best similarity of each candidate to any single preference, so broad profiles don't dilute matches."""
+        prefs = sorted({pref.strip().lower() for pref in preferences or [] if pref and pref.strip()})
+        if not prefs:
+            return np.zeros(index.size, dtype=np.float32)
+        return index.score_many([self.user_vector([pref]) for pref in prefs]).max(axis=0)
+
+    def blend(self, relevance: np.ndarray, similarity: np.ndarray, interest_weight: float = INTEREST_WEIGHT) -> np.ndarray:
+        """Final ranking score from LLM relevance (1-10) and interest similarity (0-1), both scaled to 0-1."""
+        relevance = np.clip(np.asarray(relevance, dtype=np.float32), 0, 10) / 10
+        return (1 - interest_weight) * relevance + interest_weight * np.asarray(similarity, dtype=np.float32)
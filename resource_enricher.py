@@ -0,0 +1,275 @@
+import asyncio
+import os
+import threading
+from dataclasses import dataclass
+from typing import List, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import httpx
+
+from ttl_cache import TTLCache
+
+# Query parameters that only carry tracking information and never change the target page
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "si", "ref", "ref_src"}
+
+# Status codes returned by servers that refuse HEAD but serve GET fine
+HEAD_UNSUPPORTED = {403, 405, 501}
+
+# Status codes that say more about the checker than the link: auth walls, bot blocking and rate limits
+# (Udemy, Coursera and YouTube often answer non-browser clients with these). 5xx is treated the same.
+INCONCLUSIVE_STATUSES = {401, 403, 429}
+
+
+@dataclass
+class URLCheck:
+    """Outcome of checking a single canonical URL."""
+    url: str
+    valid: Optional[bool]  # None means the check was inconclusive (timeout, connect error, 401/403/429, 5xx)
+    status: Optional[int] = None
+    final_url: Optional[str] = None
+    content_type: str = ""
+
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """Normalize a URL so equivalent links share one cache entry. Returns None for unusable URLs."""
+    if not isinstance(url, str):
+        return None
+    url = url.strip()
+    if not url:
+        return None
+    if "://" not in url:
+        if url.startswith("/") or " " in url:
+            return None
+        url = f"https://{url}"
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if scheme not in ("http", "https") or not host:
+        return None
+
+    netloc = host
+    if port and not (scheme == "http" and port == 80) and not (scheme == "https" and port == 443):
+        netloc = f"{host}:{port}"
+
+    path = parts.path or "/"
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+
+    # Collapse the common YouTube variants onto the canonical watch URL
+    if host in ("youtu.be", "www.youtu.be") and path.strip("/"):
+        netloc, path = "www.youtube.com", "/watch"
+        query = [("v", parts.path.strip("/"))] + [(k, v) for k, v in query if k != "v"]
+    elif host in ("youtube.com", "m.youtube.com"):
+        netloc = "www.youtube.com"
+
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    return urlunsplit((scheme, netloc, path, urlencode(sorted(query)), ""))
+
+
+class ResourceEnricher:
+    """Validates LLM-emitted resource URLs and thumbnails concurrently, with a shared TTL cache.
+
+    Checks run on a dedicated event loop thread over one pooled HTTP client, so the
+    enricher can be called from synchronous code and from inside a running event loop alike.
+    """
+
+    def __init__(self, deadline: float = None, request_timeout: float = None,
+                 cache_ttl: float = None, concurrency: int = None, enabled: bool = None):
+        self.deadline = deadline if deadline is not None else float(os.getenv("RESOURCE_CHECK_DEADLINE", "2.0"))
+        self.request_timeout = request_timeout if request_timeout is not None else float(os.getenv("RESOURCE_CHECK_TIMEOUT", "5.0"))
+        self.concurrency = concurrency if concurrency is not None else int(os.getenv("RESOURCE_CHECK_CONCURRENCY", "20"))
+        if enabled is None:
+            enabled = os.getenv("RESOURCE_CHECK_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+
+        ttl = cache_ttl if cache_ttl is not None else float(os.getenv("RESOURCE_CACHE_TTL", "21600"))
+        self.cache = TTLCache(ttl=ttl)
+        # Broken links are re-checked sooner than healthy ones in case the outage was transient, and
+        # inconclusive ones (blocked, rate limited, timed out) sooner still
+        self.negative_ttl = min(ttl, 1800)
+        self.inconclusive_ttl = min(ttl, 300)
+
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self._inflight = {}
+        self._start_lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is not None:
+                return self._loop
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="resource-enricher", daemon=True)
+            thread.start()
+            self._loop = loop
+            return loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=httpx.Timeout(self.request_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                    keepalive_expiry=30.0
+                ),
+                headers={"User-Agent": "Leembo.AI link checker"}
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._client
+
+    async def _fetch(self, url: str) -> URLCheck:
+        client = self._get_client()
+        async with self._semaphore:
+            try:
+                response = await client.head(url)
+                if response.status_code in HEAD_UNSUPPORTED:
+                    async with client.stream("GET", url) as response:
+                        pass
+            except (httpx.TooManyRedirects, httpx.UnsupportedProtocol):
+                return URLCheck(url=url, valid=False)
+            except httpx.HTTPError:
+                # Timeouts and connection failures may be on our side or transient
+                return URLCheck(url=url, valid=None)
+
+        status = response.status_code
+        if status in INCONCLUSIVE_STATUSES or status >= 500:
+            valid = None
+        else:
+            valid = status < 400
+        final_url = canonicalize_url(str(response.url)) or url
+        return URLCheck(
+            url=url,
+            valid=valid,
+            status=response.status_code,
+            final_url=final_url,
+            content_type=response.headers.get("content-type", "").split(";")[0].strip().lower()
+        )
+
+    async def _check(self, url: str) -> URLCheck:
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached
+
+        # Share a single in-flight request between concurrent callers asking for the same URL
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda t, url=url: self._store(url, t))
+        return await asyncio.shield(task)
+
+    def _store(self, url: str, task: asyncio.Future):
+        self._inflight.pop(url, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if result.valid is True:
+            self.cache.set(url, result)
+        elif result.valid is False:
+            self.cache.set(url, result, ttl=self.negative_ttl)
+        else:
+            self.cache.set(url, result, ttl=self.inconclusive_ttl)
+
+    async def check_urls(self, urls: List[str], deadline: float = None) -> Dict[str, URLCheck]:
+        """Check canonical URLs concurrently, returning whatever finished before the deadline.
+
+        Checks still running at the deadline keep going in the background and land in the cache.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        tasks = {url: asyncio.ensure_future(self._check(url)) for url in dict.fromkeys(urls)}
+        if not tasks:
+            return {}
+        await asyncio.wait(tasks.values(), timeout=deadline)
+        return {
+            url: task.result()
+            for url, task in tasks.items()
+            if task.done() and not task.cancelled() and task.exception() is None
+        }
+
+    def check_urls_sync(self, urls: List[str], deadline: float = None) -> Dict[str, URLCheck]:
+        """Blocking wrapper around check_urls that never waits much longer than the deadline."""
+        deadline = self.deadline if deadline is None else deadline
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self.check_urls(urls, deadline), loop)
+        try:
+            return future.result(timeout=deadline + 0.5)
+        except Exception as e:
+            print(f"Error checking resource URLs: {str(e)}")
+            return {}
+
+    def enrich_resources(self, resources: List[Dict], url_key: str = "url",
+                         thumbnail_key: str = None, thumbnail_placeholder: str = "") -> List[Dict]:
+        """Canonicalize, deduplicate and validate resource links.
+
+        Resources with malformed or confirmed-broken (e.g. 404) URLs are dropped. Links whose check
+        was inconclusive or did not finish before the deadline are kept. Broken or non-image thumbnails are replaced
+        with the placeholder.
+        """
+        unique = []
+        seen = set()
+        for resource in resources:
+            if not isinstance(resource, dict):
+                continue
+            url = canonicalize_url(resource.get(url_key))
+            if url is None or url in seen:
+                continue
+            seen.add(url)
+            unique.append((url, dict(resource)))
+
+        thumbnails = {}
+        if thumbnail_key:
+            for _, resource in unique:
+                thumbnail = canonicalize_url(resource.get(thumbnail_key))
+                if thumbnail:
+                    thumbnails[id(resource)] = thumbnail
+
+        if not self.enabled:
+            for url, resource in unique:
+                resource[url_key] = url
+            return [resource for _, resource in unique]
+
+        checks = self.check_urls_sync([url for url, _ in unique] + list(thumbnails.values()))
+
+        enriched = []
+        for url, resource in unique:
+            check = checks.get(url)
+            if check is not None and check.valid is False:
+                continue
+            resource[url_key] = check.final_url if check is not None and check.final_url else url
+
+            thumbnail = thumbnails.get(id(resource))
+            if thumbnail is not None:
+                thumb_check = checks.get(thumbnail)
+                if thumb_check is not None and (
+                    thumb_check.valid is False or
+                    (thumb_check.valid and thumb_check.content_type and not thumb_check.content_type.startswith("image/"))
+                ):
+                    resource[thumbnail_key] = thumbnail_placeholder
+                else:
+                    resource[thumbnail_key] = thumbnail
+            enriched.append(resource)
+
+        return enriched
+
+    def close(self):
+        """Close the pooled HTTP client and stop the background event loop."""
+        if self._loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result(timeout=5)
+            self._client = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
@@ -0,0 +1,114 @@
+import importlib
+import sys
+import threading
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Base handler for local stub servers; keep-alive HTTP/1.1 with quiet logging."""
+
+    protocol_version = "HTTP/1.1"
+
+    def send(self, status: int, body: bytes = b"", content_type: str = "text/html", headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Start a stub HTTP server for a handler class on a free local port; returns its base URL."""
+    servers = []
+
+    def start(handler_class) -> str:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class _StandIn:
+    """Keyword-argument record used for crewai/tavily classes when those packages are not installed."""
+
+    def __init__(self, *args, **kwargs):
+        self.__dict__.update(kwargs)
+
+    def kickoff(self):
+        raise RuntimeError("stand-in Crew cannot run; patch LeemboAI.Crew in the test")
+
+
+def _stand_in_modules():
+    crewai = types.ModuleType("crewai")
+    crewai.Agent = crewai.Task = crewai.Crew = crewai.LLM = _StandIn
+    crewai.Process = types.SimpleNamespace(sequential="sequential")
+    tavily = types.ModuleType("tavily")
+    tavily.TavilyClient = _StandIn
+    dotenv = types.ModuleType("dotenv")
+    dotenv.load_dotenv = lambda *args, **kwargs: None
+    return {"crewai": crewai, "tavily": tavily, "dotenv": dotenv}
+
+
+@pytest.fixture
+def leembo(monkeypatch):
+    """The LeemboAI module, imported with stand-ins for crewai/tavily/python-dotenv if they are not installed.
+
+    Tests drive the real LeemboAI code paths against local stub servers or patched Crew classes,
+    so only the constructors of these third-party classes are ever needed.
+    """
+    monkeypatch.setenv("TAVILY_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.delenv("MODEL_ROUTES_FILE", raising=False)
+    for name, module in _stand_in_modules().items():
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            monkeypatch.setitem(sys.modules, name, module)
+    # Import afresh, and drop this import again afterwards so stand-ins never leak into other tests
+    monkeypatch.delitem(sys.modules, "LeemboAI", raising=False)
+    module = importlib.import_module("LeemboAI")
+    monkeypatch.setitem(sys.modules, "LeemboAI", sys.modules.pop("LeemboAI"))
+    return module
+
+
+@pytest.fixture
+def mentor(leembo, tmp_path):
+    mentor = leembo.LeemboAI(cache_dir=str(tmp_path))
+    mentor.resource_enricher.enabled = False
+    yield mentor
+    mentor.resource_enricher.close()
+
+
+@pytest.fixture
+def api(leembo, tmp_path, monkeypatch):
+    """The api module, imported afresh with its job store, caches and demand log under tmp_path.
+
+    Startup handlers do not run, so no job workers or cache warmer are started.
+    """
+    monkeypatch.setenv("LEEMBO_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("LEEMBO_JOBS_DB", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.delenv("LEEMBO_ASYNC_IO", raising=False)
+    monkeypatch.delitem(sys.modules, "api", raising=False)
+    importlib.import_module("api")
+    module = sys.modules.pop("api")
+    monkeypatch.setitem(sys.modules, "api", module)
+    module.mentor.resource_enricher.enabled = False
+    yield module
+    module.demand_log.flush()
+    module.mentor.resource_enricher.close()
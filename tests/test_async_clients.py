@@ -0,0 +1,144 @@
+import asyncio
+import json
+
+from async_clients import AsyncLLMClient, AsyncTavilyClient
+from conftest import StubHandler
+from model_router import ModelRouter, ModelSpec
+
+
+class UpstreamHandler(StubHandler):
+    """Stub Tavily /search and OpenAI-compatible /v1/chat/completions endpoints."""
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path == "/search":
+            body = {"query": payload.get("query"), "results": [{"title": "Result", "url": "https://example.com"}]}
+        elif self.path == "/v1/chat/completions":
+            body = {
+                "choices": [{"message": {"role": "assistant", "content": f"echo {payload['model']}"}}],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5}
+            }
+        else:
+            self.send(404)
+            return
+        self.send(200, json.dumps(body).encode("utf-8"), content_type="application/json")
+
+
+def test_tavily_client_reuses_connections(stub_server):
+    base_url = stub_server(UpstreamHandler)
+
+    async def run():
+        client = AsyncTavilyClient(api_key="test", base_url=base_url)
+        try:
+            for i in range(5):
+                result = await client.search(f"query {i}")
+                assert result["query"] == f"query {i}"
+            await asyncio.gather(*(client.search(f"concurrent {i}") for i in range(5)))
+        finally:
+            await client.aclose()
+        return client.stats.snapshot()
+
+    stats = asyncio.run(run())
+    assert stats["requests"] == 10
+    assert stats["errors"] == 0
+    assert 1 <= stats["connections_opened"] < stats["requests"]
+    assert stats["connection_reuse_ratio"] > 0
+    # Plain-HTTP stub: no TLS handshakes to save, but none are counted either
+    assert stats["tls_handshakes"] == 0
+
+
+def test_llm_client_reuses_connections(stub_server):
+    spec = ModelSpec(model="stub-model", base_url=f"{stub_server(UpstreamHandler)}/v1", api_key="test")
+
+    async def run():
+        client = AsyncLLMClient(api_key="test")
+        try:
+            for _ in range(6):
+                content, usage = await client.chat(spec, [{"role": "user", "content": "hi"}])
+                assert content == "echo stub-model"
+                assert usage["total_tokens"] == 5
+        finally:
+            await client.aclose()
+        return client.stats.snapshot()
+
+    stats = asyncio.run(run())
+    assert stats["requests"] == 6
+    assert stats["connections_opened"] == 1
+
+
+
+TOPICS = [
+    {"topic": "Rust ownership", "category": "Technology", "relevance_score": 7},
+    {"topic": "Baking bread", "category": "Other", "relevance_score": 8},
+    {"topic": "Quantum error correction", "category": "Science", "relevance_score": 9},
+]
+COURSES = [
+    {"id": "1", "title": "Rust in Depth", "platform": "YouTube", "url": "https://www.youtube.com/watch?v=rust&utm_source=x"},
+    {"id": "2", "title": "No URL"},
+]
+
+
+class SidebarHandler(UpstreamHandler):
+    """Upstream stub whose chat completions answer trend analyzer and curator prompts."""
+
+    def do_POST(self):
+        if self.path != "/v1/chat/completions":
+            return super().do_POST()
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        prompt = payload["messages"][-1]["content"]
+        content = json.dumps(TOPICS if "trending educational topics" in prompt else COURSES)
+        body = {"choices": [{"message": {"content": content}}], "usage": {"total_tokens": 5}}
+        self.send(200, json.dumps(body).encode("utf-8"), content_type="application/json")
+
+
+def point_mentor_at(mentor, base_url: str):
+    mentor.async_tavily_client.base_url = base_url
+    route = {"model": "stub-model", "base_url": f"{base_url}/v1", "api_key": "test"}
+    mentor.model_router = ModelRouter({"trend_analyzer": route, "curator": route})
+
+
+def run_and_close(mentor, coroutine):
+    async def run():
+        try:
+            return await coroutine
+        finally:
+            await mentor.aclose()
+            await mentor.llm_client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_async_trending_topics_use_pooled_clients(stub_server, mentor):
+    point_mentor_at(mentor, stub_server(SidebarHandler))
+
+    async def lookups():
+        return [await mentor.atrending_topics_result(limit=2, user_preferences=["Rust"]) for _ in range(3)]
+
+    results = run_and_close(mentor, lookups())
+    # Rust ownership matches the user's interest, which outweighs its lower relevance score
+    assert results == [(["Rust ownership", "Quantum error correction"], False)] * 3
+    assert mentor.io_stats()["tavily"]["requests"] == 3
+    assert mentor.io_stats()["tavily"]["connections_opened"] == 1
+    assert mentor.io_stats()["llm"]["connections_opened"] == 1
+
+
+def test_async_recommended_courses_validate_curator_output(stub_server, mentor):
+    point_mentor_at(mentor, stub_server(SidebarHandler))
+    courses, is_fallback = run_and_close(mentor, mentor.arecommended_courses_result(["Rust"], "Rust", limit=4))
+
+    assert not is_fallback
+    assert [course["title"] for course in courses] == ["Rust in Depth"]
+    assert courses[0]["url"] == "https://www.youtube.com/watch?v=rust"
+    assert courses[0]["thumbnail"] == "/api/placeholder/400/225"
+
+
+def test_async_sidebar_lookups_fall_back_when_upstream_fails(stub_server, mentor):
+    point_mentor_at(mentor, stub_server(StubHandler))
+
+    topics, topics_fallback = run_and_close(mentor, mentor.atrending_topics_result(limit=3))
+    courses, courses_fallback = run_and_close(mentor, mentor.arecommended_courses_result([], "python", limit=2))
+    assert topics_fallback and len(topics) == 3
+    assert courses_fallback
+    assert [course["title"] for course in courses] == [
+        "Python for Everybody", "Complete Machine Learning & Data Science Bootcamp"
+    ]
@@ -0,0 +1,132 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from job_queue import FAILED, QUEUED, RUNNING, SUCCEEDED, IdempotencyConflict, JobStore, JobWorkerPool
+
+ASSESSMENT = {"level": "Beginner", "style": "Visual"}
+
+
+class FakeMentor:
+    """Just enough of LeemboAI for JobWorkerPool: a package cache and the learning stages."""
+
+    def __init__(self, fail_stage: str = None):
+        self.fail_stage = fail_stage
+        self.stages_run = []
+        self.cached = {}
+        self.package_cache = SimpleNamespace(
+            get=lambda topic, level, style: self.cached.get((topic, level, style)),
+            set=lambda topic, level, style, package, source="api": self.cached.__setitem__((topic, level, style), package)
+        )
+
+    def run_learning_stages(self, topic, level, style, completed=None, on_stage=None, tier=None):
+        results = dict(completed or {})
+        for stage in ("resources", "explanation", "quiz"):
+            if stage in results:
+                continue
+            if stage == self.fail_stage:
+                raise RuntimeError(f"{stage} failed")
+            self.stages_run.append(stage)
+            results[stage] = f"{stage} for {topic}"
+            if on_stage is not None:
+                on_stage(stage, results[stage])
+        return results
+
+    def fallback_stages(self, topic, package):
+        return []
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(path=str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+
+
+def expire_lease():
+    time.sleep(0.06)
+
+
+def test_job_resumes_from_checkpoints_after_lease_expiry(store):
+    job, created = store.submit("Rust", ASSESSMENT)
+    assert created
+
+    # Worker A finishes one stage, then dies without renewing its lease
+    first = store.claim("worker-a", lease_seconds=0.05)
+    assert store.checkpoint(first["id"], "worker-a", "resources", "resources from a")
+    expire_lease()
+
+    second = store.claim("worker-b", lease_seconds=60)
+    assert second["id"] == job["id"]
+    assert second["attempts"] == 2
+    assert second["checkpoints"] == {"resources": "resources from a"}
+
+    mentor = FakeMentor()
+    JobWorkerPool(store, mentor).process(second)
+    assert mentor.stages_run == ["explanation", "quiz"]
+
+    done = store.get(job["id"])
+    assert done["status"] == SUCCEEDED
+    assert done["result"]["resources"] == "resources from a"
+    assert done["result"]["quiz"] == "quiz for Rust"
+    assert ("Rust", "Beginner", "Visual") in mentor.cached
+
+
+def test_reused_idempotency_key(store):
+    job, created = store.submit("Rust", ASSESSMENT, idempotency_key="key-1")
+    same, created_again = store.submit("Rust", dict(ASSESSMENT), idempotency_key="key-1")
+    assert created and not created_again
+    assert same["id"] == job["id"]
+
+    with pytest.raises(IdempotencyConflict):
+        store.submit("Go", ASSESSMENT, idempotency_key="key-1")
+    with pytest.raises(IdempotencyConflict):
+        store.submit("Rust", {"level": "Advanced", "style": "Visual"}, idempotency_key="key-1")
+
+
+def test_stale_worker_cannot_update_reclaimed_job(store):
+    job, _ = store.submit("Rust", ASSESSMENT)
+    store.claim("worker-a", lease_seconds=0.05)
+    expire_lease()
+    store.claim("worker-b", lease_seconds=60)
+
+    assert not store.checkpoint(job["id"], "worker-a", "quiz", "stale quiz")
+    assert not store.complete(job["id"], "worker-a", {"explanation": "stale"})
+    assert not store.fail(job["id"], "worker-a", "stale failure")
+
+    current = store.get(job["id"])
+    assert current["status"] == RUNNING
+    assert current["worker_id"] == "worker-b"
+    assert current["checkpoints"] == {}
+    assert current["error"] is None
+
+    assert store.complete(job["id"], "worker-b", {"explanation": "fresh"})
+    assert store.get(job["id"])["result"] == {"explanation": "fresh"}
+
+
+def test_job_fails_after_max_attempts(store):
+    job, _ = store.submit("Rust", ASSESSMENT)
+    pool = JobWorkerPool(store, FakeMentor(fail_stage="quiz"))
+
+    pool.process(store.claim("worker-a", lease_seconds=60))
+    retried = store.get(job["id"])
+    assert retried["status"] == QUEUED
+    assert retried["checkpoints"] == {"resources": "resources for Rust", "explanation": "explanation for Rust"}
+
+    pool.process(store.claim("worker-a", lease_seconds=60))
+    failed = store.get(job["id"])
+    assert failed["status"] == FAILED
+    assert failed["error"] == "quiz failed"
+    assert store.claim("worker-a", lease_seconds=60) is None
+
+
+def test_expired_lease_on_final_attempt_fails_job(store):
+    job, _ = store.submit("Rust", ASSESSMENT)
+    for _ in range(store.max_attempts):
+        assert store.claim("worker-a", lease_seconds=0.05)["id"] == job["id"]
+        expire_lease()
+
+    assert store.claim("worker-b", lease_seconds=60) is None
+    failed = store.get(job["id"])
+    assert failed["status"] == FAILED
+    assert failed["error"] == "Lease expired on the final attempt"
+    assert store.queue_depth() == 0
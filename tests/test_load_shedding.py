@@ -0,0 +1,141 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from load_shedding import CACHE_ONLY, ERROR, FULL, MINIMAL, REDUCED, LoadMonitor, OverloadedError
+
+ASSESSMENT = {"level": "Beginner", "style": "Visual"}
+
+
+def make_monitor(queued: int = 0, **overrides) -> LoadMonitor:
+    options = dict(depth_thresholds=[2, 4, 6], latency_thresholds=[1.0, 2.0, 3.0], min_samples=3)
+    options.update(overrides)
+    monitor = LoadMonitor(queue_depth=lambda: queued, **options)
+    monitor.refresh_queue_depth()
+    return monitor
+
+
+@pytest.mark.parametrize("queued, tier", [(0, FULL), (1, FULL), (2, REDUCED), (4, MINIMAL), (6, CACHE_ONLY), (50, CACHE_ONLY)])
+def test_depth_maps_to_tier(queued, tier):
+    assert make_monitor(queued).tier() == tier
+
+
+def test_in_flight_generations_count_towards_depth():
+    monitor = make_monitor(queued=1)
+    monitor.begin()
+    assert monitor.depth() == 2
+    assert monitor.tier() == REDUCED
+    monitor.end()
+    assert monitor.tier() == FULL
+
+
+@pytest.mark.parametrize("latency, tier", [(0.5, FULL), (1.5, REDUCED), (2.5, MINIMAL), (3.5, CACHE_ONLY)])
+def test_p95_latency_maps_to_tier(latency, tier):
+    monitor = make_monitor()
+    for _ in range(3):
+        monitor.begin()
+        monitor.end(latency)
+    assert monitor.tier() == tier
+
+
+def test_latency_needs_min_samples_and_expires():
+    monitor = make_monitor(latency_window=0.05)
+    monitor.begin()
+    monitor.end(10.0)
+    assert monitor.p95_latency() == 0.0
+
+    for _ in range(2):
+        monitor.begin()
+        monitor.end(10.0)
+    assert monitor.tier() == CACHE_ONLY
+
+    time.sleep(0.06)
+    assert monitor.tier() == FULL
+
+
+def test_the_more_degraded_signal_wins():
+    monitor = make_monitor(queued=2)
+    for _ in range(3):
+        monitor.begin()
+        monitor.end(2.5)
+    assert monitor.tier() == MINIMAL
+
+
+def test_queue_depth_is_cached_and_read_off_the_caller():
+    calls = []
+    monitor = LoadMonitor(queue_depth=lambda: calls.append(1) or 7, depth_thresholds=[2, 4, 6], depth_ttl=60)
+    monitor.refresh_queue_depth()
+    for _ in range(100):
+        assert monitor.tier() == CACHE_ONLY
+    assert len(calls) == 1
+
+    # A stale depth is refreshed in the background; the caller gets the last value without waiting
+    monitor.queue_depth = lambda: time.sleep(0.2) or 0
+    monitor.depth_ttl = 0
+    started = time.perf_counter()
+    assert monitor.depth() == 7
+    assert time.perf_counter() - started < 0.1
+    time.sleep(0.3)
+    assert monitor.depth() == 0
+
+
+def test_queue_depth_error_keeps_last_value():
+    depths = iter([5])
+
+    def queue_depth():
+        return next(depths)
+
+    monitor = LoadMonitor(queue_depth=queue_depth, depth_ttl=60)
+    monitor.refresh_queue_depth()
+    monitor.refresh_queue_depth()
+    assert monitor.depth() == 5
+
+
+def test_record_served_and_rejected():
+    monitor = make_monitor()
+    monitor.record_served(FULL, cached=True)
+    monitor.record_served(REDUCED)
+    monitor.record_served(ERROR)
+    monitor.record_rejected()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["served"] == {FULL: 1, REDUCED: 1, MINIMAL: 0, ERROR: 1}
+    assert snapshot["cached_served"] == 1
+    assert snapshot["rejected"] == 1
+    assert snapshot["tier"] == FULL
+
+
+def test_overloaded_error_retry_after(monkeypatch):
+    monkeypatch.setenv("LOAD_RETRY_AFTER", "12")
+    assert OverloadedError().retry_after == 12
+    assert OverloadedError(retry_after=3).retry_after == 3
+
+
+def shed_everything(api):
+    api.load_monitor.depth_thresholds = [0, 0, 0]
+    assert api.load_monitor.tier() == CACHE_ONLY
+
+
+def test_cache_only_miss_returns_503(api):
+    shed_everything(api)
+    response = TestClient(api.app).post("/api/learn", json={"topic": "Rust", "assessment": ASSESSMENT})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+    assert api.load_monitor.snapshot()["rejected"] == 1
+
+
+def test_cache_only_serves_cached_packages(api):
+    package = {"topic": "Rust", "assessment": ASSESSMENT, "resources": [], "explanation": "Ownership.", "quiz": []}
+    api.mentor.package_cache.set("Rust", "Beginner", "Visual", package)
+    shed_everything(api)
+    response = TestClient(api.app).post("/api/learn", json={"topic": "Rust", "assessment": ASSESSMENT})
+
+    assert response.status_code == 200
+    assert response.json()["cached"] is True
+    assert response.json()["service_tier"] == FULL
+    snapshot = api.load_monitor.snapshot()
+    assert snapshot["served"][FULL] == 1
+    assert snapshot["cached_served"] == 1
+    assert snapshot["rejected"] == 0
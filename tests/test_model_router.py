@@ -0,0 +1,189 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import StubHandler
+from model_router import ModelRouter
+
+
+def chat_handler(content: str, delay: float = 0.0, status: int = 200):
+    """A stub OpenAI-compatible /chat/completions endpoint answering with fixed content."""
+
+    class ChatHandler(StubHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(delay)
+            if status != 200:
+                self.send(status, b'{"error": "stub failure"}', content_type="application/json")
+                return
+            body = {
+                "choices": [{"message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+            }
+            self.send(200, json.dumps(body).encode("utf-8"), content_type="application/json")
+
+    return ChatHandler
+
+
+def make_router(primary_url: str, fallback_url: str, **overrides) -> ModelRouter:
+    config = {
+        "model": "primary-model",
+        "base_url": f"{primary_url}/v1",
+        "api_key": "test",
+        "fallback_model": "fast-model",
+        "fallback_base_url": f"{fallback_url}/v1",
+        "fallback_api_key": "test",
+        "slo_seconds": 0.1,
+        "cooldown_seconds": 0.3,
+    }
+    config.update(overrides)
+    return ModelRouter({"explainer": config})
+
+
+EXPLAIN = SimpleNamespace(description="Explain recursion.", expected_output="An explanation")
+
+
+def call_many(mentor, count: int):
+    """Run `count` explainer tasks through LeemboAI._arun_task; failed calls come back as None."""
+
+    async def run():
+        try:
+            results = []
+            for _ in range(count):
+                try:
+                    results.append(await mentor._arun_task("explainer", EXPLAIN))
+                except Exception:
+                    results.append(None)
+            return results
+        finally:
+            await mentor.llm_client.aclose()
+
+    return asyncio.run(run())
+
+
+def primary_metrics(router: ModelRouter):
+    route = router.route("explainer")
+    return router.metrics()["explainer"]["models"][f"{route.primary.model}@{route.primary.base_url}"]
+
+
+def test_fast_primary_stays_on_primary(stub_server, mentor):
+    mentor.model_router = make_router(stub_server(chat_handler("primary")), stub_server(chat_handler("fallback")))
+    assert call_many(mentor, 4) == ["primary"] * 4
+    assert not mentor.model_router.is_degraded("explainer")
+    assert primary_metrics(mentor.model_router)["total_tokens"] == 60
+    assert mentor.model_router.total_tokens() == 60
+
+
+def test_slo_violations_trip_route_to_fallback(stub_server, mentor):
+    mentor.model_router = make_router(
+        stub_server(chat_handler("primary", delay=0.2)), stub_server(chat_handler("fallback"))
+    )
+    assert call_many(mentor, 4) == ["primary", "primary", "primary", "fallback"]
+    assert mentor.model_router.is_degraded("explainer")
+    assert mentor.model_router.metrics()["explainer"]["degraded"] is True
+
+
+def test_cooldown_expiry_returns_to_primary(stub_server, mentor):
+    mentor.model_router = make_router(
+        stub_server(chat_handler("primary", delay=0.2)), stub_server(chat_handler("fallback"))
+    )
+    call_many(mentor, 3)
+    assert mentor.model_router.select("explainer").model == "fast-model"
+
+    time.sleep(0.35)
+    assert not mentor.model_router.is_degraded("explainer")
+    assert call_many(mentor, 1) == ["primary"]
+
+
+def test_primary_error_retries_on_fallback_without_tripping(stub_server, mentor):
+    mentor.model_router = make_router(
+        stub_server(chat_handler("primary", status=500)), stub_server(chat_handler("fallback"))
+    )
+    # The failed primary call is retried on the fallback, but one error alone does not degrade the route
+    assert call_many(mentor, 1) == ["fallback"]
+    assert not mentor.model_router.is_degraded("explainer")
+
+    # A second error in a row trips the route, so the third call goes straight to the fallback
+    assert call_many(mentor, 2) == ["fallback", "fallback"]
+    assert mentor.model_router.is_degraded("explainer")
+    assert primary_metrics(mentor.model_router)["errors"] == 2
+
+
+def test_error_without_fallback_propagates(stub_server, mentor):
+    mentor.model_router = ModelRouter({"explainer": {
+        "model": "primary-model", "base_url": f"{stub_server(chat_handler('', status=500))}/v1", "api_key": "test"
+    }})
+    assert call_many(mentor, 1) == [None]
+
+
+class FakeCrew:
+    """Stands in for crewai.Crew: answers per model name and reports token usage like CrewOutput."""
+
+    outcomes = {}
+    crews = []
+
+    def __init__(self, agents, tasks, process=None):
+        self.agents = agents
+        self.tasks = tasks
+        FakeCrew.crews.append(self)
+
+    def kickoff(self):
+        outcome = FakeCrew.outcomes[self.agents[0].llm.model]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(raw=outcome, token_usage={"prompt_tokens": 30, "completion_tokens": 12, "total_tokens": 42})
+
+
+@pytest.fixture
+def fake_crew(leembo, monkeypatch):
+    FakeCrew.outcomes = {}
+    FakeCrew.crews = []
+    monkeypatch.setattr(leembo, "Crew", FakeCrew)
+    return FakeCrew
+
+
+def crew_task(leembo):
+    return leembo.Task(description="Explain recursion.", expected_output="An explanation")
+
+
+def test_run_crew_uses_routed_model_and_records_token_usage(mentor, leembo, fake_crew):
+    mentor.model_router = make_router("http://primary.invalid", "http://fallback.invalid")
+    fake_crew.outcomes = {"primary-model": "primary", "fast-model": "fallback"}
+
+    assert mentor._run_crew("explainer", crew_task(leembo)).raw == "primary"
+    assert primary_metrics(mentor.model_router)["total_tokens"] == 42
+    assert primary_metrics(mentor.model_router)["prompt_tokens"] == 30
+
+    # Every kickoff gets its own agent, never the shared template from setup_agents
+    mentor._run_crew("explainer", crew_task(leembo))
+    agents = [crew.agents[0] for crew in fake_crew.crews]
+    assert agents[0] is not agents[1]
+    assert mentor.explainer not in agents
+    assert fake_crew.crews[0].tasks[0].agent is agents[0]
+
+
+def test_run_crew_retries_failed_primary_on_fallback(mentor, leembo, fake_crew):
+    mentor.model_router = make_router("http://primary.invalid", "http://fallback.invalid")
+    fake_crew.outcomes = {"primary-model": RuntimeError("primary down"), "fast-model": "fallback"}
+
+    assert mentor._run_crew("explainer", crew_task(leembo)).raw == "fallback"
+    assert [crew.agents[0].llm.model for crew in fake_crew.crews] == ["primary-model", "fast-model"]
+    assert primary_metrics(mentor.model_router)["errors"] == 1
+    assert mentor.model_router.total_tokens() == 42
+    assert not mentor.model_router.is_degraded("explainer")
+
+
+def test_default_routes_read_model_names_at_construction(monkeypatch):
+    # Set after model_router was imported, as load_dotenv() does for LeemboAI
+    monkeypatch.delenv("MODEL_ROUTES_FILE", raising=False)
+    monkeypatch.setenv("OPENAI_MODEL_NAME", "env-default")
+    monkeypatch.setenv("FAST_MODEL_NAME", "env-fast")
+
+    router = ModelRouter()
+    assert router.select("explainer").model == "env-default"
+    assert router.route("explainer").fallback.model == "env-fast"
+    assert router.select("quiz_generator").model == "env-fast"
+    assert router.select("unknown_role").model == "env-default"
@@ -0,0 +1,35 @@
+import time
+
+from package_cache import PackageCache
+
+PACKAGE = {"topic": "Rust", "resources": [], "explanation": "Ownership.", "quiz": []}
+
+
+def count_rows(cache: PackageCache) -> int:
+    conn = cache._connect()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM packages").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_topic_whitespace_and_case_share_a_package(tmp_path):
+    cache = PackageCache(str(tmp_path), ttl=60)
+    cache.set("Rust  Ownership", "Beginner", "Visual", PACKAGE)
+    assert cache.get(" rust ownership ", "beginner", "VISUAL") == PACKAGE
+    assert cache.get("Rust Ownership", "Advanced", "Visual") is None
+
+
+def test_set_purges_expired_packages_at_most_once_per_interval(tmp_path):
+    cache = PackageCache(str(tmp_path), ttl=0.05, purge_interval=0.2)
+    cache.set("Rust", "Beginner", "Visual", PACKAGE)
+    time.sleep(0.1)
+    assert cache.get("Rust", "Beginner", "Visual") is None
+
+    # Within the purge interval the expired row stays on disk
+    cache.set("Go", "Beginner", "Visual", PACKAGE)
+    assert count_rows(cache) == 2
+
+    time.sleep(0.2)
+    cache.set("Zig", "Beginner", "Visual", PACKAGE)
+    assert count_rows(cache) == 1
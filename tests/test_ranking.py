@@ -0,0 +1,89 @@
+import random
+import time
+
+import numpy as np
+import pytest
+
+from ranking import DENSE_POOL_SIZE, CandidateIndex, InterestRanker, top_k, vectorize
+
+
+def random_texts(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(3000)]
+    return [" ".join(rng.choices(vocabulary, k=rng.randint(1, 8))) for _ in range(count)]
+
+
+def test_dense_and_sparse_scoring_agree():
+    texts = random_texts(DENSE_POOL_SIZE)
+    dense = CandidateIndex(list(range(len(texts))), texts)
+    # One more candidate than the dense limit switches to the inverted index
+    sparse = CandidateIndex(list(range(len(texts) + 1)), texts + ["term1 term2"])
+    assert dense._dense is not None and sparse._dense is None
+
+    ranker = InterestRanker()
+    for query in (["term1", "term2 term3"], ["term42"], ["not in the pool"], []):
+        vector = ranker.user_vector(query)
+        np.testing.assert_allclose(dense.score(vector), sparse.score(vector)[:-1], atol=1e-6)
+
+
+def test_scores_are_cosine_similarities():
+    index = CandidateIndex(["a", "b", "c"], ["rust ownership", "rust", "python"])
+    scores = index.score(vectorize(["rust ownership"]))
+    assert scores[0] == pytest.approx(1.0)
+    assert 0 < scores[1] < 1
+    assert scores[2] == 0
+
+
+def test_top_k_breaks_ties_by_tiebreak_then_position():
+    scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1], dtype=np.float32)
+    assert top_k(scores, 3).tolist() == [1, 0, 2]
+    tiebreak = np.array([1.0, 0.0, 3.0, 2.0, 9.0], dtype=np.float32)
+    assert top_k(scores, 3, tiebreak).tolist() == [1, 2, 3]
+    assert top_k(scores, 10, tiebreak).tolist() == [1, 2, 3, 0, 4]
+    assert top_k(scores, 0).tolist() == []
+
+
+def test_blend_weights_relevance_and_similarity():
+    ranker = InterestRanker()
+    blended = ranker.blend([10, 5, 0, 20], [0.0, 1.0, 0.5, 0.0], interest_weight=0.4)
+    np.testing.assert_allclose(blended, [0.6, 0.7, 0.2, 0.6], atol=1e-6)
+
+
+def titles(courses):
+    return [course["title"] for course in courses]
+
+
+def test_fallback_courses_are_ordered_by_match_then_rating(mentor, leembo):
+    assert titles(mentor._get_fallback_courses("python")) == [
+        "Python for Everybody",
+        "Complete Machine Learning & Data Science Bootcamp",
+    ]
+    # The topic outweighs preferences; equally matched courses are ordered by rating
+    assert titles(mentor._get_fallback_courses("web development", ["javascript"])) == [
+        "JavaScript Crash Course for Beginners",
+        "The Web Developer Bootcamp",
+        "Modern React with Redux",
+    ]
+    assert titles(mentor._get_fallback_courses(None, ["machine learning"], limit=1)) == [
+        "Complete Machine Learning & Data Science Bootcamp",
+    ]
+
+
+def test_fallback_courses_without_a_match_return_the_catalog_head(mentor, leembo):
+    assert titles(mentor._get_fallback_courses("cooking")) == titles(leembo.FALLBACK_COURSES[:4])
+
+
+def test_large_pool_reranks_quickly():
+    texts = random_texts(50000, seed=1)
+    index = CandidateIndex(list(range(len(texts))), texts)
+    ranker = InterestRanker()
+    preferences = ["term1 term2", "term3", "term4 term5"]
+    ranker.user_vector(preferences)
+
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        top_k(ranker.score(index, preferences), 10)
+        timings.append(time.perf_counter() - started)
+    # Typically about a millisecond; the bound leaves room for slow CI machines
+    assert min(timings) < 0.05
@@ -0,0 +1,130 @@
+import time
+
+import pytest
+
+from conftest import StubHandler
+from resource_enricher import ResourceEnricher, canonicalize_url
+
+
+class LinkHandler(StubHandler):
+    hits = {}
+
+    def do_HEAD(self):
+        if self.path == "/no-head":
+            self.send(405)
+        else:
+            self.do_GET()
+
+    def do_GET(self):
+        LinkHandler.hits[self.path] = LinkHandler.hits.get(self.path, 0) + 1
+        if self.path in ("/ok", "/no-head"):
+            self.send(200, b"<html>ok</html>")
+        elif self.path == "/moved":
+            self.send(301, headers={"Location": "/ok"})
+        elif self.path == "/forbidden":
+            self.send(403)
+        elif self.path == "/ratelimited":
+            self.send(429)
+        elif self.path == "/slow":
+            time.sleep(1.0)
+            self.send(200)
+        elif self.path == "/image.png":
+            self.send(200, b"\x89PNG", content_type="image/png")
+        else:
+            self.send(404)
+
+
+@pytest.fixture
+def base_url(stub_server):
+    return stub_server(LinkHandler)
+
+
+@pytest.fixture
+def enricher():
+    enricher = ResourceEnricher(deadline=3.0, request_timeout=5.0, enabled=True)
+    yield enricher
+    enricher.close()
+
+
+def test_canonicalize_url_strips_tracking_and_collapses_youtube():
+    assert canonicalize_url("https://youtu.be/abc?utm_source=x") == "https://www.youtube.com/watch?v=abc"
+    assert canonicalize_url("HTTPS://Example.com:443/path/?b=2&a=1&fbclid=z") == "https://example.com/path?a=1&b=2"
+    assert canonicalize_url("/relative/path") is None
+
+
+def test_ok_and_missing_links(base_url, enricher):
+    checks = enricher.check_urls_sync([f"{base_url}/ok", f"{base_url}/missing"])
+    assert checks[f"{base_url}/ok"].valid is True
+    assert checks[f"{base_url}/missing"].valid is False
+    assert checks[f"{base_url}/missing"].status == 404
+
+
+def test_head_not_allowed_falls_back_to_get(base_url, enricher):
+    check = enricher.check_urls_sync([f"{base_url}/no-head"])[f"{base_url}/no-head"]
+    assert check.valid is True
+    assert check.status == 200
+
+
+def test_redirect_is_followed_to_final_url(base_url, enricher):
+    check = enricher.check_urls_sync([f"{base_url}/moved"])[f"{base_url}/moved"]
+    assert check.valid is True
+    assert check.final_url == f"{base_url}/ok"
+
+
+def test_blocked_and_rate_limited_links_are_inconclusive(base_url, enricher):
+    checks = enricher.check_urls_sync([f"{base_url}/forbidden", f"{base_url}/ratelimited"])
+    assert checks[f"{base_url}/forbidden"].valid is None
+    assert checks[f"{base_url}/ratelimited"].valid is None
+
+
+def test_inconclusive_results_are_cached_briefly(base_url, enricher):
+    LinkHandler.hits.clear()
+    url = f"{base_url}/ratelimited"
+    enricher.check_urls_sync([url])
+    assert enricher.check_urls_sync([url])[url].valid is None
+    assert LinkHandler.hits["/ratelimited"] == 1
+    assert enricher.inconclusive_ttl < enricher.negative_ttl
+
+
+def test_unreachable_host_is_inconclusive(enricher):
+    # Nothing listens on port 9 (discard) locally, so the connection is refused
+    check = enricher.check_urls_sync(["http://127.0.0.1:9/page"])["http://127.0.0.1:9/page"]
+    assert check.valid is None
+
+
+def test_enrich_resources_drops_broken_and_duplicate_links(base_url, enricher):
+    resources = [
+        {"title": "Good", "url": f"{base_url}/ok?utm_source=newsletter", "thumbnail": f"{base_url}/image.png"},
+        {"title": "Duplicate", "url": f"{base_url}/ok"},
+        {"title": "Broken", "url": f"{base_url}/missing"},
+        {"title": "Blocked", "url": f"{base_url}/forbidden", "thumbnail": f"{base_url}/ok"},
+        {"title": "Moved", "url": f"{base_url}/moved"},
+    ]
+    enriched = enricher.enrich_resources(resources, thumbnail_key="thumbnail", thumbnail_placeholder="placeholder.png")
+
+    assert [r["title"] for r in enriched] == ["Good", "Blocked", "Moved"]
+    assert enriched[0]["url"] == f"{base_url}/ok"
+    assert enriched[0]["thumbnail"] == f"{base_url}/image.png"
+    # An HTML page is not a usable thumbnail
+    assert enriched[1]["thumbnail"] == "placeholder.png"
+    assert enriched[2]["url"] == f"{base_url}/ok"
+
+
+def test_deadline_overrun_keeps_link_and_fills_cache_in_background(base_url):
+    enricher = ResourceEnricher(deadline=0.2, request_timeout=5.0, enabled=True)
+    try:
+        slow = f"{base_url}/slow"
+        started = time.monotonic()
+        enriched = enricher.enrich_resources([{"title": "Slow", "url": slow}])
+        assert time.monotonic() - started < 0.9
+        assert [r["title"] for r in enriched] == ["Slow"]
+        assert enricher.cache.get(slow) is None
+
+        # The check keeps running after the deadline and lands in the cache
+        for _ in range(30):
+            if enricher.cache.get(slow) is not None:
+                break
+            time.sleep(0.1)
+        assert enricher.cache.get(slow).valid is True
+    finally:
+        enricher.close()
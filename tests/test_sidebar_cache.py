@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+
+def counting_lookup(calls, is_fallback=False, delay=0.2):
+    def trending_topics_result(limit, user_age, user_preferences):
+        calls.append(limit)
+        time.sleep(delay)
+        return [f"Topic {i}" for i in range(limit)], is_fallback
+
+    return trending_topics_result
+
+
+def test_concurrent_misses_share_one_lookup(api):
+    calls = []
+    api.mentor.trending_topics_result = counting_lookup(calls)
+
+    async def run():
+        return await asyncio.gather(*(api._trending_topics(3, "30", ["Rust", "rust "]) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert calls == [3]
+    assert {etag for _, etag, _ in results} == {results[0][1]}
+    assert not api.inflight_payloads
+
+    # The result is now cached; a forced refresh looks it up again
+    asyncio.run(api._trending_topics(3, "31", ["rust"]))
+    assert calls == [3]
+    asyncio.run(api._trending_topics(3, "31", ["rust"], force=True))
+    assert calls == [3, 3]
+
+
+def test_fallback_results_are_not_cached(api):
+    calls = []
+    api.mentor.trending_topics_result = counting_lookup(calls, is_fallback=True, delay=0)
+    client = TestClient(api.app)
+
+    first = client.get("/api/trending_topics", params={"limit": 2})
+    second = client.get("/api/trending_topics", params={"limit": 2})
+    assert first.json() == {"topics": ["Topic 0", "Topic 1"]}
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert len(calls) == 2
+    assert second.status_code == 200
+
+
+def test_cached_get_revalidates_with_etag(api):
+    calls = []
+    api.mentor.trending_topics_result = counting_lookup(calls, delay=0)
+    client = TestClient(api.app)
+
+    first = client.get("/api/trending_topics", params={"limit": 2})
+    assert first.headers["Cache-Control"].startswith("public, max-age=")
+    second = client.get("/api/trending_topics", params={"limit": 2}, headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    assert len(calls) == 1
+
+    client.get("/api/trending_topics", params={"limit": 2}, headers={"Cache-Control": "no-cache"})
+    assert len(calls) == 2